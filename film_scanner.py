@@ -1,1708 +1,2523 @@
-"""
-Epson V300 Film Scanner Application
-A modern, clean interface for scanning analog film
-"""
-
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, simpledialog
-from PIL import Image, ImageTk, ImageOps, ImageFilter, ImageEnhance
-import os
-from datetime import datetime
-import threading
-import numpy as np
-from PIL.ImageChops import invert as pil_invert
-import logging
-import traceback
-import sys
-
-try:
-    import twain
-    TWAIN_AVAILABLE = True
-except ImportError:
-    TWAIN_AVAILABLE = False
-
-
-class FilmScannerApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Film Scanner Pro - Epson V300")
-        self.root.geometry("1400x900")
-        self.root.configure(bg='#2b2b2b')
-        
-        # Scanner variables
-        self.source_manager = None
-        self.scanner = None
-        self.scanner_name = ""
-        self.is_wia = False
-        self.is_wia = False
-        self.preview_image = None
-        self.preview_image_original = None
-        self.scanned_images = []
-        
-        # Image adjustment variables
-        self.brightness = tk.DoubleVar(value=1.0)
-        self.contrast = tk.DoubleVar(value=1.0)
-        self.exposure = tk.DoubleVar(value=0.0)
-        self.invert_negative = tk.BooleanVar(value=False)
-        self.remove_dust = tk.BooleanVar(value=False)
-        self.rotation_angle = tk.IntVar(value=0)
-        self.flip_horizontal = tk.BooleanVar(value=False)
-        self.flip_vertical = tk.BooleanVar(value=False)
-        
-        # Crop variables
-        self.crop_active = False
-        self.crop_start = None
-        self.crop_end = None
-        self.crop_rect = None
-        
-        # Queue variables
-        self.scan_queue = []
-        self.queue_processing = False
-        self.queue_paused = False
-        
-        # Debug mode and logging
-        self.debug_mode = tk.BooleanVar(value=False)
-        self.setup_logging()
-        
-        # Settings
-        self.resolution = tk.IntVar(value=2400)
-        self.color_mode = tk.StringVar(value="Color")
-        self.file_format = tk.StringVar(value="TIFF")
-        default_output = os.path.normpath(os.path.join(os.path.expanduser("~"), "Desktop", "Scans"))
-        self.output_dir = tk.StringVar(value=default_output)
-        self.auto_increment = tk.BooleanVar(value=True)
-        self.auto_detect = tk.BooleanVar(value=True)
-        self.scan_counter = 1
-        
-        self.setup_ui()
-        
-        # Initialize scanner after window is shown
-        self.root.after(100, self.initialize_scanner)
-        
-        # Bind adjustment changes to update preview
-        self.brightness.trace_add('write', self.update_preview_adjustments)
-        self.contrast.trace_add('write', self.update_preview_adjustments)
-        self.exposure.trace_add('write', self.update_preview_adjustments)
-        self.invert_negative.trace_add('write', self.update_preview_adjustments)
-        self.remove_dust.trace_add('write', self.update_preview_adjustments)
-    
-    def setup_ui(self):
-        """Create the user interface"""
-        # Modern color scheme
-        bg_color = '#2b2b2b'
-        fg_color = '#ffffff'
-        accent_color = '#0078d4'
-        panel_color = '#3c3c3c'
-        
-        # Style configuration
-        style = ttk.Style()
-        style.theme_use('clam')
-        style.configure('TFrame', background=bg_color)
-        style.configure('TLabel', background=bg_color, foreground=fg_color, font=('Segoe UI', 10))
-        style.configure('TButton', font=('Segoe UI', 10), padding=6)
-        style.configure('Accent.TButton', background=accent_color, foreground='white', font=('Segoe UI', 11, 'bold'))
-        
-        # Main container
-        main_frame = ttk.Frame(self.root, padding="10")
-        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        
-        # Left panel - Controls
-        left_panel = tk.Frame(main_frame, bg=panel_color, width=350)
-        left_panel.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
-        left_panel.grid_propagate(False)
-        
-        # Create scrollable frame for left panel
-        canvas = tk.Canvas(left_panel, bg=panel_color, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(left_panel, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=panel_color)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Title
-        title_label = tk.Label(scrollable_frame, text="Film Scanner Pro", font=('Segoe UI', 18, 'bold'),
-                               bg=panel_color, fg=fg_color)
-        title_label.pack(pady=20)
-        
-        # Scanner Status
-        status_frame = tk.LabelFrame(scrollable_frame, text="Scanner Status", bg=panel_color, fg=fg_color,
-                                     font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
-        status_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        self.status_label = tk.Label(status_frame, text="Initializing...", bg=panel_color, fg='#ffa500',
-                                     font=('Segoe UI', 9))
-        self.status_label.pack()
-        
-        # Scan Settings
-        settings_frame = tk.LabelFrame(scrollable_frame, text="Scan Settings", bg=panel_color, fg=fg_color,
-                                       font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
-        settings_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        # Resolution
-        tk.Label(settings_frame, text="Resolution (DPI):", bg=panel_color, fg=fg_color).grid(row=0, column=0, sticky=tk.W, pady=5)
-        resolution_combo = ttk.Combobox(settings_frame, textvariable=self.resolution, width=15,
-                                       values=[1200, 2400, 3200, 4800, 6400])
-        resolution_combo.grid(row=0, column=1, pady=5)
-        
-        # Color Mode
-        tk.Label(settings_frame, text="Color Mode:", bg=panel_color, fg=fg_color).grid(row=1, column=0, sticky=tk.W, pady=5)
-        color_combo = ttk.Combobox(settings_frame, textvariable=self.color_mode, width=15,
-                                   values=["Color", "Grayscale", "Black & White"])
-        color_combo.grid(row=1, column=1, pady=5)
-        
-        # File Format
-        tk.Label(settings_frame, text="File Format:", bg=panel_color, fg=fg_color).grid(row=2, column=0, sticky=tk.W, pady=5)
-        format_combo = ttk.Combobox(settings_frame, textvariable=self.file_format, width=15,
-                                    values=["TIFF", "PNG", "JPEG"])
-        format_combo.grid(row=2, column=1, pady=5)
-        
-        # Image Adjustments Frame
-        adjust_frame = tk.LabelFrame(scrollable_frame, text="Image Adjustments", bg=panel_color, fg=fg_color,
-                                     font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
-        adjust_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        # Brightness
-        tk.Label(adjust_frame, text="Brightness:", bg=panel_color, fg=fg_color).grid(row=0, column=0, sticky=tk.W, pady=3)
-        brightness_scale = tk.Scale(adjust_frame, from_=0.5, to=2.0, resolution=0.1, orient=tk.HORIZONTAL,
-                                   variable=self.brightness, bg=panel_color, fg=fg_color, highlightthickness=0,
-                                   length=150, troughcolor='#555555')
-        brightness_scale.grid(row=0, column=1, pady=3)
-        
-        # Contrast
-        tk.Label(adjust_frame, text="Contrast:", bg=panel_color, fg=fg_color).grid(row=1, column=0, sticky=tk.W, pady=3)
-        contrast_scale = tk.Scale(adjust_frame, from_=0.5, to=2.0, resolution=0.1, orient=tk.HORIZONTAL,
-                                 variable=self.contrast, bg=panel_color, fg=fg_color, highlightthickness=0,
-                                 length=150, troughcolor='#555555')
-        contrast_scale.grid(row=1, column=1, pady=3)
-        
-        # Exposure
-        tk.Label(adjust_frame, text="Exposure:", bg=panel_color, fg=fg_color).grid(row=2, column=0, sticky=tk.W, pady=3)
-        exposure_scale = tk.Scale(adjust_frame, from_=-1.0, to=1.0, resolution=0.1, orient=tk.HORIZONTAL,
-                                 variable=self.exposure, bg=panel_color, fg=fg_color, highlightthickness=0,
-                                 length=150, troughcolor='#555555')
-        exposure_scale.grid(row=2, column=1, pady=3)
-        
-        # Negative Inversion
-        tk.Checkbutton(adjust_frame, text="Invert Negative", variable=self.invert_negative,
-                      bg=panel_color, fg=fg_color, selectcolor=panel_color,
-                      activebackground=panel_color, activeforeground=fg_color).grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=3)
-        
-        # Dust Removal
-        tk.Checkbutton(adjust_frame, text="Remove Dust/Scratches", variable=self.remove_dust,
-                      bg=panel_color, fg=fg_color, selectcolor=panel_color,
-                      activebackground=panel_color, activeforeground=fg_color).grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=3)
-        
-        # Reset button
-        reset_btn = tk.Button(adjust_frame, text="Reset All", command=self.reset_adjustments,
-                             bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2')
-        reset_btn.grid(row=5, column=0, columnspan=2, pady=5)
-        
-        # Transform Frame
-        transform_frame = tk.LabelFrame(scrollable_frame, text="Transform", bg=panel_color, fg=fg_color,
-                                       font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
-        transform_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        # Rotation buttons
-        rotate_frame = tk.Frame(transform_frame, bg=panel_color)
-        rotate_frame.pack(fill=tk.X, pady=5)
-        
-        tk.Button(rotate_frame, text="⟲ 90°", command=lambda: self.rotate_image(-90),
-                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2', width=8).pack(side=tk.LEFT, padx=2)
-        tk.Button(rotate_frame, text="⟳ 90°", command=lambda: self.rotate_image(90),
-                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2', width=8).pack(side=tk.LEFT, padx=2)
-        tk.Button(rotate_frame, text="180°", command=lambda: self.rotate_image(180),
-                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2', width=8).pack(side=tk.LEFT, padx=2)
-        
-        # Flip buttons
-        flip_frame = tk.Frame(transform_frame, bg=panel_color)
-        flip_frame.pack(fill=tk.X, pady=5)
-        
-        tk.Button(flip_frame, text="Flip H", command=self.flip_h,
-                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2', width=12).pack(side=tk.LEFT, padx=2)
-        tk.Button(flip_frame, text="Flip V", command=self.flip_v,
-                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2', width=12).pack(side=tk.LEFT, padx=2)
-        
-        # Crop button
-        self.crop_btn = tk.Button(transform_frame, text="✂ Crop Selection", command=self.toggle_crop_mode,
-                                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2')
-        self.crop_btn.pack(fill=tk.X, pady=5)
-        
-        # Output Directory
-        output_frame = tk.LabelFrame(scrollable_frame, text="Output", bg=panel_color, fg=fg_color,
-                                     font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
-        output_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        tk.Label(output_frame, text="Save to:", bg=panel_color, fg=fg_color).pack(anchor=tk.W)
-        
-        dir_frame = tk.Frame(output_frame, bg=panel_color)
-        dir_frame.pack(fill=tk.X, pady=5)
-        
-        self.dir_label = tk.Label(dir_frame, text=self.output_dir.get()[:30] + "...", 
-                                  bg=panel_color, fg='#aaaaaa', anchor=tk.W)
-        self.dir_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        
-        browse_btn = ttk.Button(dir_frame, text="Browse", command=self.browse_directory)
-        browse_btn.pack(side=tk.RIGHT)
-        
-        tk.Checkbutton(output_frame, text="Auto-increment filenames", variable=self.auto_increment,
-                      bg=panel_color, fg=fg_color, selectcolor=panel_color,
-                      activebackground=panel_color, activeforeground=fg_color).pack(anchor=tk.W, pady=5)
-        
-        tk.Checkbutton(output_frame, text="Auto-detect film frames", variable=self.auto_detect,
-                      bg=panel_color, fg=fg_color, selectcolor=panel_color,
-                      activebackground=panel_color, activeforeground=fg_color).pack(anchor=tk.W, pady=2)
-        
-        # Action Buttons
-        button_frame = tk.Frame(scrollable_frame, bg=panel_color)
-        button_frame.pack(fill=tk.X, padx=10, pady=20)
-        
-        self.preview_btn = tk.Button(button_frame, text="Preview", command=self.preview_scan,
-                                     bg='#555555', fg='white', font=('Segoe UI', 11),
-                                     relief=tk.FLAT, cursor='hand2', padx=20, pady=10)
-        self.preview_btn.pack(fill=tk.X, pady=5)
-        
-        self.scan_btn = tk.Button(button_frame, text="Scan", command=self.start_scan,
-                                  bg=accent_color, fg='white', font=('Segoe UI', 12, 'bold'),
-                                  relief=tk.FLAT, cursor='hand2', padx=20, pady=12)
-        self.scan_btn.pack(fill=tk.X, pady=5)
-        
-        self.batch_btn = tk.Button(button_frame, text="Batch Scan", command=self.batch_scan,
-                                   bg='#0d6efd', fg='white', font=('Segoe UI', 11),
-                                   relief=tk.FLAT, cursor='hand2', padx=20, pady=10)
-        self.batch_btn.pack(fill=tk.X, pady=5)
-        
-        # Queue Frame
-        queue_frame = tk.LabelFrame(scrollable_frame, text="Scan Queue", bg=panel_color, fg=fg_color,
-                                    font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
-        queue_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        queue_btn_frame = tk.Frame(queue_frame, bg=panel_color)
-        queue_btn_frame.pack(fill=tk.X, pady=5)
-        
-        tk.Button(queue_btn_frame, text="Add to Queue", command=self.add_to_queue,
-                 bg='#6c757d', fg='white', relief=tk.FLAT, cursor='hand2', width=12).pack(side=tk.LEFT, padx=2)
-        tk.Button(queue_btn_frame, text="Clear Queue", command=self.clear_queue,
-                 bg='#dc3545', fg='white', relief=tk.FLAT, cursor='hand2', width=12).pack(side=tk.LEFT, padx=2)
-        
-        self.queue_label = tk.Label(queue_frame, text="Queue: 0 scans", bg=panel_color, fg=fg_color,
-                                    font=('Segoe UI', 9))
-        self.queue_label.pack(pady=5)
-        
-        self.process_queue_btn = tk.Button(queue_frame, text="▶ Process Queue", command=self.process_queue,
-                                          bg='#28a745', fg='white', font=('Segoe UI', 10, 'bold'),
-                                          relief=tk.FLAT, cursor='hand2')
-        self.process_queue_btn.pack(fill=tk.X, pady=5)
-        
-        self.pause_queue_btn = tk.Button(queue_frame, text="⏸ Pause Queue", command=self.toggle_pause_queue,
-                                        bg='#ffc107', fg='black', font=('Segoe UI', 9),
-                                        relief=tk.FLAT, cursor='hand2', state=tk.DISABLED)
-        self.pause_queue_btn.pack(fill=tk.X, pady=2)
-        
-        # Statistics
-        stats_frame = tk.LabelFrame(scrollable_frame, text="Session Info", bg=panel_color, fg=fg_color,
-                                    font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
-        stats_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        self.stats_label = tk.Label(stats_frame, text="Scans completed: 0", bg=panel_color, fg=fg_color)
-        self.stats_label.pack()
-        
-        # Debug Frame
-        debug_frame = tk.LabelFrame(scrollable_frame, text="Debug Tools", bg=panel_color, fg=fg_color,
-                                    font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
-        debug_frame.pack(fill=tk.X, padx=10, pady=10)
-        
-        tk.Checkbutton(debug_frame, text="Enable Debug Mode", variable=self.debug_mode,
-                      bg=panel_color, fg=fg_color, selectcolor=panel_color,
-                      activebackground=panel_color, activeforeground=fg_color,
-                      command=self.toggle_debug_mode).pack(anchor=tk.W, pady=3)
-        
-        tk.Button(debug_frame, text="View Error Log", command=self.show_error_log,
-                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2').pack(fill=tk.X, pady=2)
-        
-        tk.Button(debug_frame, text="Test Connection", command=self.test_scanner_connection,
-                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2').pack(fill=tk.X, pady=2)
-        
-        # Right panel - Preview
-        right_panel = tk.Frame(main_frame, bg=panel_color)
-        right_panel.grid(row=0, column=1, sticky=(tk.W, tk.E, tk.N, tk.S))
-        main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(0, weight=1)
-        
-        preview_header = tk.Frame(right_panel, bg=panel_color)
-        preview_header.pack(fill=tk.X, pady=10)
-        
-        preview_label = tk.Label(preview_header, text="Preview", font=('Segoe UI', 14, 'bold'),
-                                bg=panel_color, fg=fg_color)
-        preview_label.pack(side=tk.LEFT, padx=20)
-        
-        self.crop_info_label = tk.Label(preview_header, text="", font=('Segoe UI', 9),
-                                        bg=panel_color, fg='#ffa500')
-        self.crop_info_label.pack(side=tk.RIGHT, padx=20)
-        
-        # Preview canvas
-        self.preview_canvas = tk.Canvas(right_panel, bg='#1a1a1a', highlightthickness=0)
-        self.preview_canvas.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
-        
-        self.preview_text = self.preview_canvas.create_text(
-            400, 300, text="No preview available\nClick 'Preview' to see scan preview",
-            fill='#666666', font=('Segoe UI', 12), justify=tk.CENTER
-        )
-        
-        # Bind crop events
-        self.preview_canvas.bind("<Button-1>", self.crop_mouse_down)
-        self.preview_canvas.bind("<B1-Motion>", self.crop_mouse_drag)
-        self.preview_canvas.bind("<ButtonRelease-1>", self.crop_mouse_up)
-    
-    def reset_adjustments(self):
-        """Reset all image adjustments to default"""
-        self.brightness.set(1.0)
-        self.contrast.set(1.0)
-        self.exposure.set(0.0)
-        self.invert_negative.set(False)
-        self.remove_dust.set(False)
-        self.rotation_angle.set(0)
-        self.flip_horizontal.set(False)
-        self.flip_vertical.set(False)
-        self.update_preview_adjustments()
-    
-    def setup_logging(self):
-        """Setup logging system"""
-        log_dir = os.path.normpath(os.path.join(os.path.expanduser("~"), "Desktop", "Scans", "logs"))
-        os.makedirs(log_dir, exist_ok=True)
-        
-        log_file = os.path.join(log_dir, f"scanner_log_{datetime.now().strftime('%Y%m%d')}.log")
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
-        
-        self.logger = logging.getLogger(__name__)
-        self.logger.info("Film Scanner Pro started")
-        self.log_file = log_file
-    
-    def toggle_debug_mode(self):
-        """Toggle debug mode"""
-        if self.debug_mode.get():
-            self.logger.setLevel(logging.DEBUG)
-            self.logger.debug("Debug mode enabled")
-            messagebox.showinfo("Debug Mode", "Debug mode enabled\nDetailed logs will be saved")
-        else:
-            self.logger.setLevel(logging.INFO)
-            self.logger.info("Debug mode disabled")
-    
-    def show_error_log(self):
-        """Show error log in a window"""
-        try:
-            with open(self.log_file, 'r') as f:
-                log_content = f.read()
-            
-            log_window = tk.Toplevel(self.root)
-            log_window.title("Error Log")
-            log_window.geometry("800x600")
-            log_window.configure(bg='#2b2b2b')
-            
-            text_frame = tk.Frame(log_window, bg='#2b2b2b')
-            text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-            
-            scrollbar = tk.Scrollbar(text_frame)
-            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-            
-            text_widget = tk.Text(text_frame, wrap=tk.WORD, bg='#1a1a1a', fg='#00ff00',
-                                 font=('Consolas', 9), yscrollcommand=scrollbar.set)
-            text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-            scrollbar.config(command=text_widget.yview)
-            
-            text_widget.insert(tk.END, log_content)
-            text_widget.config(state=tk.DISABLED)
-            
-            # Add buttons
-            btn_frame = tk.Frame(log_window, bg='#2b2b2b')
-            btn_frame.pack(fill=tk.X, padx=10, pady=5)
-            
-            tk.Button(btn_frame, text="Refresh", command=lambda: self.refresh_log(text_widget),
-                     bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
-            tk.Button(btn_frame, text="Clear Log", command=lambda: self.clear_log(text_widget),
-                     bg='#dc3545', fg='white', relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
-            tk.Button(btn_frame, text="Open Log File", command=self.open_log_file,
-                     bg='#0078d4', fg='white', relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
-        
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not open log file:\n{str(e)}")
-    
-    def refresh_log(self, text_widget):
-        """Refresh log content"""
-        try:
-            with open(self.log_file, 'r') as f:
-                log_content = f.read()
-            text_widget.config(state=tk.NORMAL)
-            text_widget.delete(1.0, tk.END)
-            text_widget.insert(tk.END, log_content)
-            text_widget.config(state=tk.DISABLED)
-            text_widget.see(tk.END)
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not refresh log:\n{str(e)}")
-    
-    def clear_log(self, text_widget):
-        """Clear log file"""
-        if messagebox.askyesno("Clear Log", "Clear all log entries?"):
-            try:
-                with open(self.log_file, 'w') as f:
-                    f.write(f"Log cleared at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                self.refresh_log(text_widget)
-                self.logger.info("Log file cleared by user")
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not clear log:\n{str(e)}")
-    
-    def open_log_file(self):
-        """Open log file in default text editor"""
-        try:
-            os.startfile(self.log_file)
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not open log file:\n{str(e)}")
-    
-    def test_scanner_connection(self):
-        """Test scanner connection and capabilities"""
-        if not TWAIN_AVAILABLE:
-            messagebox.showwarning("TWAIN Not Available", "Cannot test connection: TWAIN library not installed")
-            return
-        
-        try:
-            result = "Scanner Connection Test\n" + "="*40 + "\n\n"
-            
-            if self.source_manager:
-                result += "✓ TWAIN Source Manager: OK\n"
-                sources = self.source_manager.GetSourceList()
-                result += f"✓ Available scanners: {len(sources)}\n"
-                for i, source in enumerate(sources, 1):
-                    result += f"  {i}. {source}\n"
-            else:
-                result += "✗ TWAIN Source Manager: Not initialized\n"
-            
-            if self.scanner:
-                result += "\n✓ Scanner connection: OK\n"
-                result += f"  Scanner ready for operation\n"
-            else:
-                result += "\n✗ Scanner connection: Not connected\n"
-            
-            result += f"\n✓ Image library (Pillow): OK\n"
-            result += f"✓ NumPy (frame detection): OK\n"
-            result += f"\nOutput directory: {self.output_dir.get()}\n"
-            
-            if os.path.exists(self.output_dir.get()):
-                result += "✓ Output directory exists\n"
-            else:
-                result += "✗ Output directory does not exist (will be created)\n"
-            
-            messagebox.showinfo("Connection Test", result)
-            self.logger.info("Scanner connection test performed")
-            
-        except Exception as e:
-            error_msg = f"Connection test failed:\n{str(e)}\n\n{traceback.format_exc()}"
-            messagebox.showerror("Test Failed", error_msg)
-            self.logger.error(f"Connection test failed: {str(e)}")
-    
-    def rotate_image(self, angle):
-        """Rotate preview image"""
-        if not self.preview_image_original:
-            return
-        
-        current = self.rotation_angle.get()
-        self.rotation_angle.set((current + angle) % 360)
-        self.update_preview_adjustments()
-    
-    def flip_h(self):
-        """Flip image horizontally"""
-        self.flip_horizontal.set(not self.flip_horizontal.get())
-        self.update_preview_adjustments()
-    
-    def flip_v(self):
-        """Flip image vertically"""
-        self.flip_vertical.set(not self.flip_vertical.get())
-        self.update_preview_adjustments()
-    
-    def toggle_crop_mode(self):
-        """Toggle crop selection mode"""
-        self.crop_active = not self.crop_active
-        if self.crop_active:
-            self.crop_btn.config(bg='#00ff00', text="✓ Crop Active - Draw Rectangle")
-            self.crop_info_label.config(text="Draw rectangle to select crop area")
-        else:
-            self.crop_btn.config(bg='#555555', text="✂ Crop Selection")
-            self.crop_info_label.config(text="")
-            if self.crop_rect:
-                self.preview_canvas.delete(self.crop_rect)
-                self.crop_rect = None
-            self.crop_start = None
-            self.crop_end = None
-    
-    def crop_mouse_down(self, event):
-        """Handle crop selection start"""
-        if not self.crop_active:
-            return
-        self.crop_start = (event.x, event.y)
-        if self.crop_rect:
-            self.preview_canvas.delete(self.crop_rect)
-    
-    def crop_mouse_drag(self, event):
-        """Handle crop selection drag"""
-        if not self.crop_active or not self.crop_start:
-            return
-        
-        if self.crop_rect:
-            self.preview_canvas.delete(self.crop_rect)
-        
-        x0, y0 = self.crop_start
-        self.crop_rect = self.preview_canvas.create_rectangle(
-            x0, y0, event.x, event.y, outline='#00ff00', width=2
-        )
-    
-    def crop_mouse_up(self, event):
-        """Handle crop selection end"""
-        if not self.crop_active or not self.crop_start:
-            return
-        
-        self.crop_end = (event.x, event.y)
-        self.apply_crop()
-    
-    def apply_crop(self):
-        """Apply crop to the preview image"""
-        if not self.preview_image_original or not self.crop_start or not self.crop_end:
-            return
-        
-        # Get canvas and image dimensions
-        canvas_width = self.preview_canvas.winfo_width()
-        canvas_height = self.preview_canvas.winfo_height()
-        
-        # Convert canvas coordinates to image coordinates
-        img = self.preview_image_original
-        
-        # Calculate the displayed image size on canvas
-        img_ratio = img.width / img.height
-        canvas_ratio = canvas_width / canvas_height
-        
-        if img_ratio > canvas_ratio:
-            display_width = canvas_width - 40
-            display_height = int(display_width / img_ratio)
-        else:
-            display_height = canvas_height - 40
-            display_width = int(display_height * img_ratio)
-        
-        # Calculate offset (image is centered)
-        offset_x = (canvas_width - display_width) // 2
-        offset_y = (canvas_height - display_height) // 2
-        
-        # Convert crop coordinates
-        x1 = int((self.crop_start[0] - offset_x) * img.width / display_width)
-        y1 = int((self.crop_start[1] - offset_y) * img.height / display_height)
-        x2 = int((self.crop_end[0] - offset_x) * img.width / display_width)
-        y2 = int((self.crop_end[1] - offset_y) * img.height / display_height)
-        
-        # Ensure coordinates are in bounds
-        x1, x2 = max(0, min(x1, x2)), min(img.width, max(x1, x2))
-        y1, y2 = max(0, min(y1, y2)), min(img.height, max(y1, y2))
-        
-        if x2 - x1 > 10 and y2 - y1 > 10:  # Minimum crop size
-            self.preview_image_original = img.crop((x1, y1, x2, y2))
-            self.update_preview_adjustments()
-            self.toggle_crop_mode()  # Exit crop mode
-            messagebox.showinfo("Crop Applied", "Crop has been applied to the preview")
-    
-    def update_preview_adjustments(self, *args):
-        """Update preview with current adjustments"""
-        if not self.preview_image_original:
-            return
-        
-        img = self.preview_image_original.copy()
-        
-        # Apply transformations
-        if self.rotation_angle.get() != 0:
-            img = img.rotate(-self.rotation_angle.get(), expand=True)
-        
-        if self.flip_horizontal.get():
-            img = ImageOps.mirror(img)
-        
-        if self.flip_vertical.get():
-            img = ImageOps.flip(img)
-        
-        # Apply adjustments
-        img = self.apply_adjustments(img)
-        
-        self.preview_image = img
-        self.display_preview(img)
-    
-    def apply_adjustments(self, image):
-        """Apply all image adjustments"""
-        try:
-            img = image.copy()
-            
-            # Brightness
-            if self.brightness.get() != 1.0:
-                enhancer = ImageEnhance.Brightness(img)
-                img = enhancer.enhance(self.brightness.get())
-            
-            # Contrast
-            if self.contrast.get() != 1.0:
-                enhancer = ImageEnhance.Contrast(img)
-                img = enhancer.enhance(self.contrast.get())
-            
-            # Exposure (using brightness on top of brightness for more range)
-            if self.exposure.get() != 0.0:
-                # Exposure: apply gamma correction
-                exposure_factor = 1.0 + self.exposure.get()
-                img_array = np.array(img).astype(np.float32)
-                img_array = np.clip(img_array * exposure_factor, 0, 255)
-                img = Image.fromarray(img_array.astype(np.uint8))
-            
-            # Negative inversion
-            if self.invert_negative.get():
-                if img.mode == 'RGB':
-                    img = ImageOps.invert(img)
-                elif img.mode == 'L':
-                    img = ImageOps.invert(img)
-            
-            # Dust/scratch removal (despeckle)
-            if self.remove_dust.get():
-                img = img.filter(ImageFilter.MedianFilter(size=3))
-            
-            return img
-            
-        except Exception as e:
-            self.logger.error(f"Error applying adjustments: {str(e)}")
-            messagebox.showwarning("Adjustment Error", 
-                f"Could not apply some adjustments:\n{str(e)}\n\nUsing original image.")
-            return image
-    
-    def initialize_scanner(self):
-        """Initialize connection to scanner"""
-        if not TWAIN_AVAILABLE:
-            self.status_label.config(text="TWAIN not available - Install python-twain", fg='#ff4444')
-            self.logger.error("TWAIN library not available")
-            messagebox.showwarning("TWAIN Not Available",
-                                 "Python TWAIN library not installed.\n\n"
-                                 "To use this scanner application, please install:\n"
-                                 "pip install pytwain\n\n"
-                                 "For now, you can test the interface in demo mode.")
-            self.scan_btn.config(state=tk.DISABLED)
-            self.preview_btn.config(state=tk.DISABLED)
-            self.batch_btn.config(state=tk.DISABLED)
-            return
-        
-        # Try multiple initialization methods
-        methods = [
-            ("Standard TWAIN DSM", lambda: self._init_standard_twain()),
-            ("Legacy TWAIN 32-bit", lambda: self._init_legacy_twain()),
-            ("WIA fallback", lambda: self._init_wia_fallback())
-        ]
-        
-        for method_name, method in methods:
-            try:
-                self.logger.info(f"Trying initialization method: {method_name}")
-                if method():
-                    return
-            except Exception as e:
-                self.logger.warning(f"{method_name} failed: {str(e)}")
-                continue
-        
-        # All methods failed
-        error_msg = "Could not connect to scanner using any method.\n\n" + \
-                   "The scanner is detected but fails to open.\n" + \
-                   "This is a known issue with some Epson TWAIN drivers.\n\n" + \
-                   "Try this fix:\n" + \
-                   "1. Open PowerShell and run:\n" + \
-                   "   python -m pip install pywin32\n\n" + \
-                   "2. Restart this app\n\n" + \
-                   "This will enable WIA support which works better\n" + \
-                   "with Epson scanners than TWAIN.\n\n" + \
-                   "The app will work in demo mode for now."
-        
-        self.status_label.config(text="Scanner not available", fg='#ff4444')
-        self.logger.error("All scanner initialization methods failed")
-        messagebox.showwarning("Scanner Not Available", error_msg)
-        self.scan_btn.config(state=tk.DISABLED)
-        self.preview_btn.config(state=tk.DISABLED)
-        self.batch_btn.config(state=tk.DISABLED)
-    
-    def _init_standard_twain(self):
-        """Try standard TWAIN initialization"""
-        self.logger.info("Attempting standard TWAIN initialization...")
-        
-        # Ensure window is ready
-        self.root.update()
-        
-        # Get proper window handle for TWAIN
-        import ctypes
-        hwnd = int(self.root.wm_frame(), 16)
-        
-        self.source_manager = twain.SourceManager(hwnd)
-        sources = self.source_manager.GetSourceList()
-        
-        if not sources:
-            raise Exception("No scanners detected")
-        
-        self.logger.info(f"Found {len(sources)} scanner(s): {sources}")
-        
-        # Reorder sources: AVOID WIA for film scanning, prefer native TWAIN
-        # Native TWAIN drivers support transparency/film settings better
-        ordered_sources = []
-        for source in sources:
-            if 'WIA-' not in source:
-                # Prefer V300 over V370 if both present
-                if 'V30/V300' in source:
-                    ordered_sources.insert(0, source)  # V300 at front
-                else:
-                    ordered_sources.append(source)
-        
-        # Add WIA as last resort
-        for source in sources:
-            if 'WIA-' in source:
-                ordered_sources.append(source)
-        
-        # Try each scanner until one works
-        last_error = None
-        for scanner_name in ordered_sources:
-            try:
-                self.logger.info(f"Trying to open: {scanner_name}")
-                self.scanner = self.source_manager.OpenSource(scanner_name)
-                self.scanner_name = scanner_name  # Store for WIA detection
-                self.is_wia = 'WIA-' in scanner_name
-                self.status_label.config(text=f"Connected: {scanner_name}", fg='#00ff00')
-                self.logger.info(f"Successfully connected to scanner: {scanner_name}")
-                return True
-            except Exception as e:
-                self.logger.warning(f"Failed to open {scanner_name}: {str(e)}")
-                last_error = e
-                continue
-        
-        # All scanners failed
-        raise Exception(f"Could not open any scanner. Last error: {last_error}")
-    
-    def _init_legacy_twain(self):
-        """Try legacy TWAIN with window handle"""
-        self.logger.info("Attempting legacy TWAIN initialization...")
-        import ctypes
-        
-        # Ensure window is visible and focused
-        self.root.update()
-        self.root.focus_force()
-        self.root.after(100)  # Small delay for window to be ready
-        self.root.update()
-        
-        # Get window handle
-        hwnd = int(self.root.wm_frame(), 16)  # Convert Tk window to hwnd
-        self.logger.info(f"Using window handle: {hwnd}")
-        
-        self.source_manager = twain.SourceManager(hwnd)
-        sources = self.source_manager.GetSourceList()
-        
-        if not sources:
-            raise Exception("No scanners detected")
-        
-        self.logger.info(f"Found {len(sources)} scanner(s): {sources}")
-        
-        # Reorder sources: AVOID WIA for film scanning, prefer native TWAIN
-        ordered_sources = []
-        for source in sources:
-            if 'WIA-' not in source:
-                if 'V30/V300' in source:
-                    ordered_sources.insert(0, source)  # V300 first
-                else:
-                    ordered_sources.append(source)
-        
-        # Add WIA as last resort
-        for source in sources:
-            if 'WIA-' in source:
-                ordered_sources.append(source)
-        
-        # Try each scanner until one works
-        last_error = None
-        for scanner_name in ordered_sources:
-            try:
-                self.logger.info(f"Trying to open: {scanner_name}")
-                self.scanner = self.source_manager.OpenSource(scanner_name)
-                self.scanner_name = scanner_name
-                self.is_wia = 'WIA-' in scanner_name
-                
-                self.status_label.config(text=f"Connected: {scanner_name}", fg='#00ff00')
-                self.logger.info(f"Legacy TWAIN connected: {scanner_name}")
-                return True
-            except Exception as e:
-                self.logger.warning(f"Failed to open {scanner_name}: {str(e)}")
-                last_error = e
-                continue
-        
-        # All scanners failed
-        raise Exception(f"Could not open any scanner. Last error: {last_error}")
-    
-    def _init_wia_fallback(self):
-        """Try WIA as fallback (Windows Image Acquisition)"""
-        self.logger.info("Attempting WIA fallback...")
-        try:
-            import win32com.client
-            wia = win32com.client.Dispatch("WIA.DeviceManager")
-            devices = wia.DeviceInfos
-            
-            if devices.Count == 0:
-                raise Exception("No WIA devices found")
-            
-            device_name = devices[1].Properties("Name").Value
-            self.logger.info(f"Found WIA device: {device_name}")
-            self.status_label.config(text=f"Connected (WIA): {device_name}", fg='#00ff00')
-            
-            # Store WIA device for later use
-            self.wia_device = wia.DeviceInfos[1].Connect()
-            self.scanner = None  # Mark as WIA mode
-            return True
-        except ImportError:
-            self.logger.warning("WIA not available (pywin32 not installed)")
-            return False
-        except Exception as e:
-            self.logger.warning(f"WIA initialization failed: {str(e)}")
-            return False
-    
-    def browse_directory(self):
-        """Browse for output directory"""
-        try:
-            initial_dir = self.output_dir.get() if os.path.exists(self.output_dir.get()) else os.path.expanduser("~")
-            directory = filedialog.askdirectory(initialdir=initial_dir)
-            
-            if directory:
-                # Validate directory is writable
-                test_file = os.path.join(directory, ".scanner_test")
-                try:
-                    with open(test_file, 'w') as f:
-                        f.write("test")
-                    os.remove(test_file)
-                    
-                    self.output_dir.set(directory)
-                    self.dir_label.config(text=directory[:30] + "...")
-                    self.logger.info(f"Output directory changed to: {directory}")
-                    
-                except PermissionError:
-                    messagebox.showerror("Permission Error", 
-                                       f"Cannot write to directory:\n{directory}\n\nPlease choose a different location.")
-                    self.logger.error(f"Permission denied for directory: {directory}")
-                    
-        except Exception as e:
-            messagebox.showerror("Error", f"Error selecting directory:\n{str(e)}")
-            self.logger.error(f"Directory selection error: {str(e)}")
-    
-    def preview_scan(self):
-        """Show preview of scan"""
-        if not TWAIN_AVAILABLE or not self.scanner:
-            messagebox.showinfo("Demo Mode", "Preview would show here when scanner is connected")
-            return
-        
-        self.status_label.config(text="Generating preview...", fg='#ffa500')
-        
-        # WIA scanners need UI on main thread
-        if self.is_wia or 'WIA-' in self.scanner_name:
-            self._do_preview()
-        else:
-            threading.Thread(target=self._do_preview, daemon=True).start()
-    
-    def _do_preview(self):
-        """Perform preview scan in background thread"""
-        try:
-            self.logger.info("Starting preview scan...")
-            self.logger.info(f"Scanner: {self.scanner_name}, is_wia: {self.is_wia}")
-            
-            if not self.scanner:
-                raise Exception("Scanner not initialized")
-            
-            # Set up scanner for preview (lower resolution)
-            # Configure for film/transparency scanning
-            if not self.is_wia and 'WIA-' not in self.scanner_name:
-                try:
-                    # Set document source to transparency unit (film holder with backlight)
-                    try:
-                        # CAP_FEEDERENABLED = False for flatbed/transparency
-                        self.scanner.SetCapability(twain.CAP_FEEDERENABLED, twain.TWTY_BOOL, False)
-                    except:
-                        pass
-                    
-                    try:
-                        # Set to transparency/film mode (this enables backlight)
-                        # ICAP_LIGHTPATH = 0x1005, TWLP_TRANSMISSIVE = 1
-                        self.scanner.SetCapability(0x1005, twain.TWTY_UINT16, 1)
-                    except:
-                        self.logger.warning("Could not set transparency mode - may need to set in scanner UI")
-                    
-                    # Set resolution
-                    self.scanner.SetCapability(twain.ICAP_XRESOLUTION, twain.TWTY_FIX32, 150)
-                    self.scanner.SetCapability(twain.ICAP_YRESOLUTION, twain.TWTY_FIX32, 150)
-                except Exception as e:
-                    self.logger.warning(f"Could not set all capabilities for preview: {e}")
-            
-            # Request scan - Always show UI for film scanning configuration
-            self.logger.info("Showing scanner UI for film settings")
-            
-            # Show instruction for film scanning
-            messagebox.showinfo("Film Scanning - IMPORTANT!",
-                "The Epson Scan window will open.\n\n"
-                "CRITICAL STEPS:\n"
-                "1. Look for 'Document Type' or mode selector\n"
-                "2. Change from 'Reflective' to 'Film' or 'Transparency'\n"
-                "3. Select 'Negative Film' or 'Positive Film'\n"
-                "4. Choose film holder type (35mm, etc.)\n"
-                "5. Preview and select scan area\n\n"
-                "The backlight will turn ON when you select Film mode!")
-            
-            self.scanner.RequestAcquire(1, 1)  # Always show UI for film scanning
-            
-            # Get image data
-            rv = self.scanner.XferImageNatively()
-            
-            # Handle both return formats: (handle, more) or just handle
-            if isinstance(rv, tuple):
-                image_handle = rv[0]
-            else:
-                image_handle = rv
-            
-            if not image_handle:
-                raise Exception("No image data received from scanner")
-            
-            # Convert DIB handle to PIL Image using pytwain's method
-            import tempfile
-            temp_bmp = tempfile.mktemp(suffix='.bmp')
-            
-            try:
-                # Use twain module's DIBToBMFile if available
-                import twain
-                if hasattr(twain, 'DIBToBMFile'):
-                    twain.DIBToBMFile(image_handle, temp_bmp)
-                    self.preview_image_original = Image.open(temp_bmp)
-                else:
-                    # Fallback: save handle as temp file and open
-                    # This is what pytwain does internally
-                    from PIL import ImageWin
-                    self.preview_image_original = ImageWin.Dib(image_handle).image
-            finally:
-                if os.path.exists(temp_bmp):
-                    try:
-                        os.remove(temp_bmp)
-                    except:
-                        pass
-            
-            if self.preview_image_original.size[0] == 0 or self.preview_image_original.size[1] == 0:
-                raise Exception("Invalid image dimensions received")
-            
-            self.preview_image = self.preview_image_original.copy()
-            self.logger.info(f"Preview scan successful: {self.preview_image_original.size}")
-            self.update_preview_adjustments()
-            
-            self.root.after(0, lambda: self.status_label.config(text="Preview ready", fg='#00ff00'))
-            
-        except Exception as e:
-            error_msg = f"Preview failed: {str(e)}"
-            self.logger.error(f"{error_msg}\n{traceback.format_exc()}")
-            self.root.after(0, lambda: self.status_label.config(text=error_msg[:50], fg='#ff4444'))
-            self.root.after(0, lambda: messagebox.showerror("Preview Error", 
-                f"{error_msg}\n\nCheck the error log for details."))
-    
-    def display_preview(self, image):
-        """Display preview image on canvas"""
-        # Resize to fit canvas
-        canvas_width = self.preview_canvas.winfo_width()
-        canvas_height = self.preview_canvas.winfo_height()
-        
-        if canvas_width < 100:  # Canvas not initialized yet
-            canvas_width = 800
-            canvas_height = 600
-        
-        # Calculate scaling
-        img_ratio = image.width / image.height
-        canvas_ratio = canvas_width / canvas_height
-        
-        if img_ratio > canvas_ratio:
-            new_width = canvas_width - 40
-            new_height = int(new_width / img_ratio)
-        else:
-            new_height = canvas_height - 40
-            new_width = int(new_height * img_ratio)
-        
-        resized = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        photo = ImageTk.PhotoImage(resized)
-        
-        # Display on canvas
-        self.preview_canvas.delete("all")
-        self.preview_canvas.create_image(canvas_width // 2, canvas_height // 2, image=photo)
-        self.preview_canvas.image = photo  # Keep reference
-    
-    def start_scan(self):
-        """Start a single scan"""
-        if not TWAIN_AVAILABLE or not self.scanner:
-            messagebox.showinfo("Demo Mode", "Scanning would occur here when scanner is connected")
-            return
-        
-        self.status_label.config(text="Scanning...", fg='#ffa500')
-        self.scan_btn.config(state=tk.DISABLED)
-        
-        # WIA scanners need UI on main thread
-        if self.is_wia or 'WIA-' in self.scanner_name:
-            self._do_scan()
-        else:
-            threading.Thread(target=self._do_scan, daemon=True).start()
-    
-    def _do_scan(self):
-        """Perform scan in background thread"""
-        try:
-            self.logger.info(f"Starting scan: {self.resolution.get()} DPI, {self.color_mode.get()} mode")
-            
-            if not self.scanner:
-                raise Exception("Scanner not initialized")
-            
-            # Validate output directory
-            if not os.path.exists(self.output_dir.get()):
-                self.logger.info(f"Creating output directory: {self.output_dir.get()}")
-                os.makedirs(self.output_dir.get(), exist_ok=True)
-            
-            # Configure scanner
-            resolution = self.resolution.get()
-            
-            if resolution < 75 or resolution > 6400:
-                raise ValueError(f"Invalid resolution: {resolution}. Must be between 75 and 6400 DPI.")
-            
-            self.logger.info(f"Scanner: {self.scanner_name}, is_wia: {self.is_wia}")
-            
-            # WIA drivers have limited capability support
-            if self.is_wia or 'WIA-' in self.scanner_name:
-                self.logger.warning("WIA scanner detected - using simplified settings")
-                self.logger.info("Note: Resolution, color mode, and film settings will be set through scanner UI")
-                self.logger.info("IMPORTANT: In the Epson dialog, select 'Film' or 'Transparency' as document type!")
-            else:
-                try:
-                    # Configure for film/transparency scanning
-                    try:
-                        # Disable feeder (use flatbed/transparency unit)
-                        self.scanner.SetCapability(twain.CAP_FEEDERENABLED, twain.TWTY_BOOL, False)
-                    except:
-                        pass
-                    
-                    try:
-                        # Set to transparency mode (enables backlight)
-                        # ICAP_LIGHTPATH = 0x1005, TWLP_TRANSMISSIVE = 1
-                        self.scanner.SetCapability(0x1005, twain.TWTY_UINT16, 1)
-                        self.logger.info("Transparency/film mode enabled (backlight on)")
-                    except:
-                        self.logger.warning("Could not set transparency mode - set 'Film' in scanner UI")
-                    
-                    # Set resolution
-                    self.scanner.SetCapability(twain.ICAP_XRESOLUTION, twain.TWTY_FIX32, resolution)
-                    self.scanner.SetCapability(twain.ICAP_YRESOLUTION, twain.TWTY_FIX32, resolution)
-                    
-                    # Set color mode
-                    if self.color_mode.get() == "Color":
-                        pixel_type = twain.TWPT_RGB
-                    elif self.color_mode.get() == "Grayscale":
-                        pixel_type = twain.TWPT_GRAY
-                    else:
-                        pixel_type = twain.TWPT_BW
-                    
-                    self.scanner.SetCapability(twain.ICAP_PIXELTYPE, twain.TWTY_UINT16, pixel_type)
-                except Exception as e:
-                    self.logger.warning(f"Could not set capabilities: {str(e)}. Using scanner defaults.")
-            
-            # Acquire image - Always show UI for film scanning
-            self.logger.debug("Requesting image acquisition...")
-            self.logger.info("Showing scanner UI for film settings")
-            
-            # Show instruction for film scanning
-            messagebox.showinfo("Film Scanning - IMPORTANT!",
-                "The Epson Scan window will open.\n\n"
-                "CRITICAL STEPS:\n"
-                "1. Look for 'Document Type' or mode selector\n"
-                "2. Change from 'Reflective' to 'Film' or 'Transparency'\n"
-                "3. Select 'Negative Film' or 'Positive Film'\n"
-                "4. Choose film holder type (35mm, etc.)\n"
-                "5. Set your scan resolution and area\n\n"
-                "The backlight will turn ON when you select Film mode!")
-            
-            self.scanner.RequestAcquire(1, 1)  # Always show UI for film scanning
-            
-            # Get image data
-            rv = self.scanner.XferImageNatively()
-            
-            # Handle both return formats: (handle, more) or just handle
-            if isinstance(rv, tuple):
-                image_handle = rv[0]
-            else:
-                image_handle = rv
-            
-            if not image_handle:
-                raise Exception("No image data received from scanner")
-            
-            # Convert DIB handle to PIL Image using pytwain's method
-            import tempfile
-            temp_bmp = tempfile.mktemp(suffix='.bmp')
-            
-            try:
-                # Use twain module's DIBToBMFile if available
-                import twain
-                if hasattr(twain, 'DIBToBMFile'):
-                    twain.DIBToBMFile(image_handle, temp_bmp)
-                    image = Image.open(temp_bmp)
-                else:
-                    # Fallback: save handle as temp file and open
-                    # This is what pytwain does internally
-                    from PIL import ImageWin
-                    image = ImageWin.Dib(image_handle).image
-            finally:
-                if os.path.exists(temp_bmp):
-                    try:
-                        os.remove(temp_bmp)
-                    except:
-                        pass
-            
-            if image.size[0] == 0 or image.size[1] == 0:
-                raise Exception("Invalid image dimensions received")
-            
-            self.logger.info(f"Image acquired: {image.size}, mode: {image.mode}")
-            
-            # Apply adjustments to scanned image
-            image = self.apply_all_transforms(image)
-            
-            # Auto-detect film frames if enabled
-            if self.auto_detect.get():
-                self.logger.debug("Attempting frame detection...")
-                frames = self.detect_film_frames(image)
-                if frames:
-                    self.logger.info(f"Detected {len(frames)} frames")
-                    self.root.after(0, lambda: self.status_label.config(
-                        text=f"Detected {len(frames)} frames, saving...", fg='#ffa500'))
-                    self.save_detected_frames(image, frames)
-                    return
-                else:
-                    self.logger.debug("No frames detected, saving as single image")
-            
-            # Save single image (no auto-detect or no frames found)
-            filename = self.generate_filename()
-            filepath = os.path.join(self.output_dir.get(), filename)
-            
-            os.makedirs(self.output_dir.get(), exist_ok=True)
-            
-            # Validate filepath
-            if len(filepath) > 260:  # Windows path length limit
-                raise Exception("File path too long. Choose a shorter output directory or filename.")
-            
-            self.logger.info(f"Saving image to: {filepath}")
-            
-            if self.file_format.get() == "TIFF":
-                image.save(filepath, "TIFF", compression="tiff_lzw")
-            elif self.file_format.get() == "PNG":
-                image.save(filepath, "PNG")
-            else:
-                image.save(filepath, "JPEG", quality=95)
-            
-            # Verify file was created
-            if not os.path.exists(filepath):
-                raise Exception("File was not created successfully")
-            
-            file_size = os.path.getsize(filepath) / (1024 * 1024)  # MB
-            self.logger.info(f"Scan completed successfully: {file_size:.2f} MB")
-            
-            self.scanned_images.append(filepath)
-            self.root.after(0, self.scan_complete, filepath)
-            
-        except ValueError as e:
-            error_msg = f"Invalid setting: {str(e)}"
-            self.logger.error(error_msg)
-            self.root.after(0, lambda: self.scan_failed(error_msg))
-            
-        except PermissionError as e:
-            error_msg = f"Permission denied: Cannot write to output directory"
-            self.logger.error(f"{error_msg}: {str(e)}")
-            self.root.after(0, lambda: self.scan_failed(error_msg))
-            
-        except Exception as e:
-            error_msg = f"Scan error: {str(e)}"
-            self.logger.error(f"{error_msg}\n{traceback.format_exc()}")
-            self.root.after(0, lambda: self.scan_failed(error_msg))
-    
-    def apply_all_transforms(self, image):
-        """Apply all transformations and adjustments to an image"""
-        img = image.copy()
-        
-        # Apply rotation
-        if self.rotation_angle.get() != 0:
-            img = img.rotate(-self.rotation_angle.get(), expand=True)
-        
-        # Apply flips
-        if self.flip_horizontal.get():
-            img = ImageOps.mirror(img)
-        
-        if self.flip_vertical.get():
-            img = ImageOps.flip(img)
-        
-        # Apply adjustments
-        img = self.apply_adjustments(img)
-        
-        return img
-    
-    def generate_filename(self):
-        """Generate filename for scanned image"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        ext_map = {"TIFF": "tif", "PNG": "png", "JPEG": "jpg"}
-        ext = ext_map[self.file_format.get()]
-        
-        if self.auto_increment.get():
-            filename = f"film_scan_{self.scan_counter:04d}.{ext}"
-            self.scan_counter += 1
-        else:
-            filename = f"film_scan_{timestamp}.{ext}"
-        
-        return filename
-    
-    def detect_film_frames(self, image):
-        """Detect individual film frames in a scanned image"""
-        try:
-            # Convert to grayscale for analysis
-            gray = ImageOps.grayscale(image)
-            
-            # Convert to numpy array
-            img_array = np.array(gray)
-            
-            # Find bright areas (film frames are typically brighter than background)
-            # Threshold to create binary image
-            threshold = np.mean(img_array) + np.std(img_array) * 0.5
-            binary = img_array > threshold
-            
-            # Find contiguous regions (simple row/column analysis)
-            frames = []
-            min_frame_size = 1000  # Minimum pixels for a frame
-            
-            # Detect columns with content
-            col_sums = np.sum(binary, axis=0)
-            col_threshold = img_array.shape[0] * 0.1  # At least 10% of column height
-            
-            in_frame = False
-            frame_start = 0
-            
-            for i, col_sum in enumerate(col_sums):
-                if col_sum > col_threshold and not in_frame:
-                    frame_start = i
-                    in_frame = True
-                elif col_sum <= col_threshold and in_frame:
-                    # Found end of frame
-                    frame_width = i - frame_start
-                    if frame_width > 100:  # Minimum width
-                        # Now find top and bottom of frame
-                        frame_region = binary[:, frame_start:i]
-                        row_sums = np.sum(frame_region, axis=1)
-                        row_threshold = frame_width * 0.1
-                        
-                        rows_with_content = np.where(row_sums > row_threshold)[0]
-                        if len(rows_with_content) > 100:  # Minimum height
-                            top = rows_with_content[0]
-                            bottom = rows_with_content[-1]
-                            
-                            # Add some padding
-                            padding = 10
-                            left = max(0, frame_start - padding)
-                            right = min(image.width, i + padding)
-                            top = max(0, top - padding)
-                            bottom = min(image.height, bottom + padding)
-                            
-                            frames.append((left, top, right, bottom))
-                    
-                    in_frame = False
-            
-            return frames
-            
-        except Exception as e:
-            print(f"Error detecting frames: {e}")
-            return []
-    
-    def save_detected_frames(self, source_image, frames):
-        """Save individual detected frames"""
-        try:
-            saved_files = []
-            
-            for i, (left, top, right, bottom) in enumerate(frames):
-                # Crop the frame
-                frame_img = source_image.crop((left, top, right, bottom))
-                
-                if frame_img:
-                    filename = self.generate_filename()
-                    filepath = os.path.join(self.output_dir.get(), filename)
-                    
-                    os.makedirs(self.output_dir.get(), exist_ok=True)
-                    
-                    if self.file_format.get() == "TIFF":
-                        frame_img.save(filepath, "TIFF", compression="tiff_lzw")
-                    elif self.file_format.get() == "PNG":
-                        frame_img.save(filepath, "PNG")
-                    else:
-                        frame_img.save(filepath, "JPEG", quality=95)
-                    
-                    saved_files.append(filepath)
-                    self.scanned_images.append(filepath)
-            
-            if saved_files:
-                self.root.after(0, lambda: self.multi_scan_complete(saved_files))
-            else:
-                self.root.after(0, lambda: self.scan_failed("No frames detected"))
-                
-        except Exception as e:
-            self.root.after(0, lambda: self.scan_failed(f"Error saving frames: {str(e)}"))
-    
-    def multi_scan_complete(self, filepaths):
-        """Handle successful multi-frame scan"""
-        self.status_label.config(text=f"Saved {len(filepaths)} frames!", fg='#00ff00')
-        self.scan_btn.config(state=tk.NORMAL)
-        self.stats_label.config(text=f"Scans completed: {len(self.scanned_images)}")
-        files_list = "\n".join([os.path.basename(f) for f in filepaths[:10]])
-        if len(filepaths) > 10:
-            files_list += f"\n... and {len(filepaths) - 10} more"
-        messagebox.showinfo("Scan Complete", f"Saved {len(filepaths)} frames:\n{files_list}")
-    
-    def scan_complete(self, filepath):
-        """Handle successful scan"""
-        self.status_label.config(text="Scan complete!", fg='#00ff00')
-        self.scan_btn.config(state=tk.NORMAL)
-        self.stats_label.config(text=f"Scans completed: {len(self.scanned_images)}")
-        messagebox.showinfo("Scan Complete", f"Image saved to:\n{filepath}")
-    
-    def scan_failed(self, error):
-        """Handle scan failure"""
-        self.status_label.config(text=f"Scan failed", fg='#ff4444')
-        self.scan_btn.config(state=tk.NORMAL)
-        
-        error_details = f"Error during scanning:\n{error}\n\n"
-        error_details += "Troubleshooting tips:\n"
-        error_details += "• Check scanner is connected and powered on\n"
-        error_details += "• Ensure scanner driver is installed\n"
-        error_details += "• Try lowering the resolution\n"
-        error_details += "• Check output directory permissions\n"
-        error_details += "• View error log for more details\n"
-        
-        messagebox.showerror("Scan Failed", error_details)
-        self.logger.error(f"Scan failed: {error}")
-    
-    def batch_scan(self):
-        """Start batch scanning mode"""
-        if not TWAIN_AVAILABLE or not self.scanner:
-            messagebox.showinfo("Demo Mode", "Batch scanning would occur here when scanner is connected")
-            return
-        
-        count = simpledialog.askinteger("Batch Scan", "How many images to scan?", 
-                                          initialvalue=5, minvalue=1, maxvalue=100)
-        if count:
-            self.status_label.config(text=f"Batch scanning {count} images...", fg='#ffa500')
-            threading.Thread(target=self._do_batch_scan, args=(count,), daemon=True).start()
-    
-    def _do_batch_scan(self, count):
-        """Perform batch scan"""
-        for i in range(count):
-            self.root.after(0, lambda i=i: self.status_label.config(
-                text=f"Scanning {i+1} of {count}...", fg='#ffa500'))
-            self._do_scan()
-            if i < count - 1:
-                self.root.after(0, lambda: messagebox.showinfo("Ready", "Load next film and click OK"))
-        
-        self.root.after(0, lambda: self.status_label.config(text="Batch scan complete!", fg='#00ff00'))
-    
-    def add_to_queue(self):
-        """Add current settings to scan queue"""
-        try:
-            # Validate settings before adding
-            if self.resolution.get() < 75 or self.resolution.get() > 6400:
-                messagebox.showerror("Invalid Settings", "Resolution must be between 75 and 6400 DPI")
-                return
-            
-            if not os.path.exists(self.output_dir.get()):
-                if not messagebox.askyesno("Create Directory", 
-                    f"Output directory does not exist:\n{self.output_dir.get()}\n\nCreate it now?"):
-                    return
-                os.makedirs(self.output_dir.get(), exist_ok=True)
-            
-            queue_item = {
-                'resolution': self.resolution.get(),
-                'color_mode': self.color_mode.get(),
-                'file_format': self.file_format.get(),
-                'brightness': self.brightness.get(),
-                'contrast': self.contrast.get(),
-                'exposure': self.exposure.get(),
-                'invert_negative': self.invert_negative.get(),
-                'remove_dust': self.remove_dust.get(),
-                'rotation_angle': self.rotation_angle.get(),
-                'flip_horizontal': self.flip_horizontal.get(),
-                'flip_vertical': self.flip_vertical.get(),
-                'auto_detect': self.auto_detect.get(),
-                'timestamp': datetime.now().strftime("%H:%M:%S")
-            }
-            
-            self.scan_queue.append(queue_item)
-            self.logger.info(f"Added scan to queue: {len(self.scan_queue)} items total")
-            self.update_queue_display()
-            messagebox.showinfo("Added to Queue", 
-                              f"Scan added to queue with current settings\n"
-                              f"Resolution: {queue_item['resolution']} DPI\n"
-                              f"Queue position: {len(self.scan_queue)}")
-            
-        except Exception as e:
-            error_msg = f"Could not add to queue: {str(e)}"
-            self.logger.error(error_msg)
-            messagebox.showerror("Queue Error", error_msg)
-    
-    def clear_queue(self):
-        """Clear all items from queue"""
-        if not self.scan_queue:
-            messagebox.showinfo("Queue Empty", "No items in queue to clear")
-            return
-        
-        if messagebox.askyesno("Clear Queue", f"Clear all {len(self.scan_queue)} items from queue?"):
-            self.scan_queue.clear()
-            self.update_queue_display()
-    
-    def update_queue_display(self):
-        """Update queue status display"""
-        count = len(self.scan_queue)
-        self.queue_label.config(text=f"Queue: {count} scan{'s' if count != 1 else ''}")
-        
-        if count > 0 and not self.queue_processing:
-            self.process_queue_btn.config(state=tk.NORMAL)
-        else:
-            self.process_queue_btn.config(state=tk.DISABLED if self.queue_processing else tk.NORMAL)
-    
-    def process_queue(self):
-        """Start processing the scan queue"""
-        if not self.scan_queue:
-            messagebox.showinfo("Queue Empty", "No scans in queue to process")
-            return
-        
-        if not TWAIN_AVAILABLE or not self.scanner:
-            messagebox.showinfo("Demo Mode", "Queue processing would occur here when scanner is connected")
-            return
-        
-        self.queue_processing = True
-        self.queue_paused = False
-        self.process_queue_btn.config(state=tk.DISABLED)
-        self.pause_queue_btn.config(state=tk.NORMAL)
-        self.scan_btn.config(state=tk.DISABLED)
-        self.batch_btn.config(state=tk.DISABLED)
-        
-        self.status_label.config(text=f"Processing queue: {len(self.scan_queue)} items...", fg='#ffa500')
-        threading.Thread(target=self._process_queue_thread, daemon=True).start()
-    
-    def toggle_pause_queue(self):
-        """Pause or resume queue processing"""
-        self.queue_paused = not self.queue_paused
-        
-        if self.queue_paused:
-            self.pause_queue_btn.config(text="▶ Resume Queue", bg='#28a745')
-            self.status_label.config(text="Queue paused", fg='#ffa500')
-        else:
-            self.pause_queue_btn.config(text="⏸ Pause Queue", bg='#ffc107')
-            self.status_label.config(text="Queue processing...", fg='#ffa500')
-    
-    def _process_queue_thread(self):
-        """Process all items in the queue"""
-        total = len(self.scan_queue)
-        completed = 0
-        
-        while self.scan_queue and self.queue_processing:
-            # Wait if paused
-            while self.queue_paused:
-                threading.Event().wait(0.5)
-                if not self.queue_processing:  # Check if stopped during pause
-                    break
-            
-            if not self.queue_processing:
-                break
-            
-            # Get next item from queue
-            queue_item = self.scan_queue[0]
-            completed += 1
-            
-            self.root.after(0, lambda c=completed, t=total: self.status_label.config(
-                text=f"Queue: Scanning {c} of {t}...", fg='#ffa500'))
-            
-            # Apply settings from queue item
-            self.root.after(0, lambda item=queue_item: self._apply_queue_settings(item))
-            threading.Event().wait(0.5)  # Give UI time to update
-            
-            # Perform the scan
-            try:
-                self._do_scan_from_queue(queue_item)
-                
-                # Remove completed item
-                self.scan_queue.pop(0)
-                self.root.after(0, self.update_queue_display)
-                
-                # Prompt to load next film if more items in queue
-                if self.scan_queue:
-                    self.root.after(0, lambda c=completed, t=total: 
-                                  messagebox.showinfo("Next Scan", 
-                                                    f"Completed {c} of {t}\n\n"
-                                                    "Load next film and click OK to continue"))
-            
-            except Exception as e:
-                self.root.after(0, lambda err=str(e): 
-                              messagebox.showerror("Queue Error", 
-                                                 f"Error during queue processing:\n{err}\n\nQueue stopped."))
-                break
-        
-        # Queue finished
-        self.queue_processing = False
-        self.root.after(0, self._queue_complete, completed)
-    
-    def _apply_queue_settings(self, queue_item):
-        """Apply settings from queue item to current settings"""
-        self.resolution.set(queue_item['resolution'])
-        self.color_mode.set(queue_item['color_mode'])
-        self.file_format.set(queue_item['file_format'])
-        self.brightness.set(queue_item['brightness'])
-        self.contrast.set(queue_item['contrast'])
-        self.exposure.set(queue_item['exposure'])
-        self.invert_negative.set(queue_item['invert_negative'])
-        self.remove_dust.set(queue_item['remove_dust'])
-        self.rotation_angle.set(queue_item['rotation_angle'])
-        self.flip_horizontal.set(queue_item['flip_horizontal'])
-        self.flip_vertical.set(queue_item['flip_vertical'])
-        self.auto_detect.set(queue_item['auto_detect'])
-    
-    def _do_scan_from_queue(self, queue_item):
-        """Perform scan with queue item settings (synchronous)"""
-        try:
-            # Configure scanner
-            resolution = queue_item['resolution']
-            self.scanner.SetCapability(twain.ICAP_XRESOLUTION, twain.TWTY_FIX32, resolution)
-            self.scanner.SetCapability(twain.ICAP_YRESOLUTION, twain.TWTY_FIX32, resolution)
-            
-            # Set color mode
-            if queue_item['color_mode'] == "Color":
-                pixel_type = twain.TWPT_RGB
-            elif queue_item['color_mode'] == "Grayscale":
-                pixel_type = twain.TWPT_GRAY
-            else:
-                pixel_type = twain.TWPT_BW
-            
-            self.scanner.SetCapability(twain.ICAP_PIXELTYPE, twain.TWTY_UINT16, pixel_type)
-            
-            # Acquire image
-            self.scanner.RequestAcquire(0, 0)
-            image_data = self.scanner.XferImageNatively()[0]
-            image = Image.open(image_data)
-            
-            # Apply transformations (using queue settings)
-            image = self._apply_transforms_from_queue(image, queue_item)
-            
-            # Auto-detect or save
-            if queue_item['auto_detect']:
-                frames = self.detect_film_frames(image)
-                if frames:
-                    self._save_frames_sync(image, frames)
-                    return
-            
-            # Save single image
-            filename = self.generate_filename()
-            filepath = os.path.join(self.output_dir.get(), filename)
-            os.makedirs(self.output_dir.get(), exist_ok=True)
-            
-            if queue_item['file_format'] == "TIFF":
-                image.save(filepath, "TIFF", compression="tiff_lzw")
-            elif queue_item['file_format'] == "PNG":
-                image.save(filepath, "PNG")
-            else:
-                image.save(filepath, "JPEG", quality=95)
-            
-            self.scanned_images.append(filepath)
-            
-        except Exception as e:
-            raise Exception(f"Scan failed: {str(e)}")
-    
-    def _apply_transforms_from_queue(self, image, queue_item):
-        """Apply transformations from queue settings"""
-        img = image.copy()
-        
-        # Rotation
-        if queue_item['rotation_angle'] != 0:
-            img = img.rotate(-queue_item['rotation_angle'], expand=True)
-        
-        # Flips
-        if queue_item['flip_horizontal']:
-            img = ImageOps.mirror(img)
-        if queue_item['flip_vertical']:
-            img = ImageOps.flip(img)
-        
-        # Adjustments
-        if queue_item['brightness'] != 1.0:
-            enhancer = ImageEnhance.Brightness(img)
-            img = enhancer.enhance(queue_item['brightness'])
-        
-        if queue_item['contrast'] != 1.0:
-            enhancer = ImageEnhance.Contrast(img)
-            img = enhancer.enhance(queue_item['contrast'])
-        
-        if queue_item['exposure'] != 0.0:
-            exposure_factor = 1.0 + queue_item['exposure']
-            img_array = np.array(img).astype(np.float32)
-            img_array = np.clip(img_array * exposure_factor, 0, 255)
-            img = Image.fromarray(img_array.astype(np.uint8))
-        
-        if queue_item['invert_negative']:
-            if img.mode in ['RGB', 'L']:
-                img = ImageOps.invert(img)
-        
-        if queue_item['remove_dust']:
-            img = img.filter(ImageFilter.MedianFilter(size=3))
-        
-        return img
-    
-    def _save_frames_sync(self, source_image, frames):
-        """Save frames synchronously (for queue processing)"""
-        for left, top, right, bottom in frames:
-            frame_img = source_image.crop((left, top, right, bottom))
-            filename = self.generate_filename()
-            filepath = os.path.join(self.output_dir.get(), filename)
-            os.makedirs(self.output_dir.get(), exist_ok=True)
-            
-            if self.file_format.get() == "TIFF":
-                frame_img.save(filepath, "TIFF", compression="tiff_lzw")
-            elif self.file_format.get() == "PNG":
-                frame_img.save(filepath, "PNG")
-            else:
-                frame_img.save(filepath, "JPEG", quality=95)
-            
-            self.scanned_images.append(filepath)
-    
-    def _queue_complete(self, completed):
-        """Handle queue completion"""
-        self.queue_processing = False
-        self.process_queue_btn.config(state=tk.NORMAL if self.scan_queue else tk.DISABLED)
-        self.pause_queue_btn.config(state=tk.DISABLED, text="⏸ Pause Queue", bg='#ffc107')
-        self.scan_btn.config(state=tk.NORMAL)
-        self.batch_btn.config(state=tk.NORMAL)
-        self.status_label.config(text=f"Queue complete! {completed} scans processed", fg='#00ff00')
-        self.stats_label.config(text=f"Scans completed: {len(self.scanned_images)}")
-        self.update_queue_display()
-        
-        messagebox.showinfo("Queue Complete", 
-                          f"All queue items processed!\n\n"
-                          f"Completed: {completed} scans\n"
-                          f"Total session scans: {len(self.scanned_images)}")
-
-
-def main():
-    root = tk.Tk()
-    app = FilmScannerApp(root)
-    root.mainloop()
-
-
-if __name__ == "__main__":
-    main()
+"""
+Epson V300 Film Scanner Application
+A modern, clean interface for scanning analog film
+"""
+
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox, simpledialog
+import os
+import pathlib
+from datetime import datetime
+import threading
+import queue
+import concurrent.futures
+import logging
+import logging.handlers
+import traceback
+import sys
+
+
+class _LazyModule:
+    """Import-on-first-use stand-in for a heavy module.
+
+    NumPy and the PIL submodules cost a few hundred milliseconds combined
+    at import and block Tk startup, but none of them are needed before the
+    first scan or preview. A module-level __getattr__ (PEP 562) only fires
+    for attribute access on the module object, not for global name lookups
+    inside this file, so the globals are bound to these proxies instead:
+    the first attribute access imports the real module and rebinds the
+    global, after which lookups go straight to it.
+    """
+
+    def __init__(self, module_name, alias):
+        self._module_name = module_name
+        self._alias = alias
+
+    def __getattr__(self, attr):
+        import importlib
+        module = importlib.import_module(self._module_name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+
+np = _LazyModule('numpy', 'np')
+Image = _LazyModule('PIL.Image', 'Image')
+ImageTk = _LazyModule('PIL.ImageTk', 'ImageTk')
+ImageOps = _LazyModule('PIL.ImageOps', 'ImageOps')
+ImageFilter = _LazyModule('PIL.ImageFilter', 'ImageFilter')
+
+# Default output locations, resolved once at import instead of rebuilding
+# the expanduser/join/normpath chain at each use
+_SCANS_DIR = pathlib.Path.home() / "Desktop" / "Scans"
+_LOG_DIR = _SCANS_DIR / "logs"
+
+
+def _encode_and_save(data, size, mode, filepath, file_format, orientation=None,
+                     tiff_compression='tiff_deflate'):
+    """Rebuild an image from raw bytes and encode it to disk.
+
+    Runs in the encode worker process, so compressing scan N overlaps the
+    acquisition of scan N+1 during batch work. The image travels as raw
+    bytes plus (mode, size) because pickling a PIL object is far slower.
+    When orientation is given, the rotation/flip rides in the metadata
+    tag (TIFF 274 / EXIF 0x0112) instead of a pixel rewrite.
+    """
+    image = Image.frombuffer(mode, size, data, 'raw', mode, 0, 1)
+    if file_format == "TIFF":
+        # Deflate with horizontal differencing (predictor, tag 317) beats
+        # LZW on photographic content in both speed and ratio; plain LZW
+        # stays available for workflows that require it
+        tiffinfo = {317: 2} if tiff_compression == 'tiff_deflate' else {}
+        if orientation:
+            tiffinfo[274] = orientation
+        image.save(filepath, "TIFF", compression=tiff_compression, tiffinfo=tiffinfo)
+    elif file_format == "PNG":
+        image.save(filepath, "PNG")
+    else:
+        # optimize/progressive stay off: each would cost an extra encoder
+        # pass over the full image for marginal size gains
+        kwargs = {'quality': 95, 'optimize': False, 'progressive': False}
+        if orientation:
+            exif = Image.Exif()
+            exif[274] = orientation
+            kwargs['exif'] = exif.tobytes()
+        image.save(filepath, "JPEG", **kwargs)
+
+try:
+    import twain
+    TWAIN_AVAILABLE = True
+except ImportError:
+    TWAIN_AVAILABLE = False
+
+_cv2 = None  # Resolved lazily: the cv2 module, or False if unavailable
+
+
+def _load_cv2():
+    """Import OpenCV on first use, caching an import failure"""
+    global _cv2
+    if _cv2 is None:
+        try:
+            import cv2
+            _cv2 = cv2
+        except ImportError:
+            _cv2 = False
+    return _cv2 or None
+
+
+_cupy = None  # Resolved lazily: the cupy module, or False if unavailable
+
+
+def _load_cupy():
+    """Import CuPy on first use, caching an import failure or missing GPU"""
+    global _cupy
+    if _cupy is None:
+        try:
+            import cupy
+            cupy.cuda.runtime.getDeviceCount()
+            _cupy = cupy
+        except Exception:
+            _cupy = False
+    return _cupy or None
+
+
+# Images below this pixel count stay on the CPU: kernel launch and
+# PCIe transfer overheads dominate for viewport-sized previews
+_GPU_MIN_PIXELS = 4_000_000
+
+
+_median3 = None  # Resolved lazily: shared stateless MedianFilter(3) instance
+
+
+def _get_median3():
+    """Return the shared 3x3 median filter, building it on first use
+
+    The filter object is stateless, so one instance serves every call
+    instead of being reallocated per frame; built lazily because
+    ImageFilter itself is imported on first use.
+    """
+    global _median3
+    if _median3 is None:
+        _median3 = ImageFilter.MedianFilter(size=3)
+    return _median3
+
+
+_colsum_kernel = None  # Resolved lazily: JIT kernel, or False if Numba is unavailable
+
+
+def _load_colsum_kernel():
+    """Compile the fused threshold + column-sum kernel on first use
+
+    Fusing the comparison into the reduction streams the grayscale
+    thumbnail once with no materialized binary intermediate.
+    """
+    global _colsum_kernel
+    if _colsum_kernel is None:
+        try:
+            import numpy
+            from numba import njit, prange, uint32
+        except ImportError:
+            _colsum_kernel = False
+            return None
+
+        @njit(parallel=True, fastmath=True, cache=True)
+        def kernel(gray, thresh):
+            """Count pixels above thresh per column of a uint8 image"""
+            height, width = gray.shape
+            out = numpy.empty(width, dtype=numpy.uint32)
+            for i in prange(width):
+                s = uint32(0)
+                for j in range(height):
+                    s += gray[j, i] > thresh
+                out[i] = s
+            return out
+
+        _colsum_kernel = kernel
+    return _colsum_kernel or None
+
+
+_adjust_kernel = None  # Resolved lazily: JIT kernel, or False if Numba is unavailable
+
+
+def _load_adjust_kernel():
+    """Compile the Numba adjustment kernel on first use, caching the result"""
+    global _adjust_kernel
+    if _adjust_kernel is None:
+        try:
+            from numba import njit, prange, uint8
+        except ImportError:
+            _adjust_kernel = False
+            return None
+
+        @njit(parallel=True, fastmath=True, cache=True)
+        def kernel(src, dst, gain, bias, invert):
+            """Fused gain/bias/clip/invert pass over a uint8 image buffer"""
+            flat_src = src.reshape(-1)
+            flat_dst = dst.reshape(-1)
+            for i in prange(flat_src.size):
+                v = flat_src[i] * gain + bias
+                if invert:
+                    v = 255.0 - v
+                if v < 0.0:
+                    v = 0.0
+                elif v > 255.0:
+                    v = 255.0
+                flat_dst[i] = uint8(v)
+
+        _adjust_kernel = kernel
+    return _adjust_kernel or None
+
+
+class FilmScannerApp:
+    # Slots skip the per-instance __dict__: attribute access on the hot
+    # preview path avoids a dict lookup, and new attributes must be
+    # declared here before use
+    __slots__ = (
+        'root', 'source_manager', 'scanner', 'scanner_name', 'is_wia',
+        'wia_device', 'preview_image', 'preview_image_original',
+        '_preview_proxy', '_tkimg', '_canvas_img_id', 'scanned_images',
+        '_proxy_l',
+        'brightness', 'contrast', 'exposure', 'invert_negative',
+        'remove_dust', 'rotation_angle', 'flip_horizontal', 'flip_vertical',
+        'crop_active', 'crop_start', 'crop_end', 'crop_rect',
+        'scan_queue', 'queue_processing', 'queue_paused', '_queue_resume',
+        '_job_q',
+        '_post_q', '_post_error',
+        '_encode_pool', '_io_pool',
+        '_preview_after_id', '_adjust_buf',
+        '_tone_lut',
+        'debug_mode', 'logger', 'log_file', '_log_pos',
+        '_file_handler', '_log_listener',
+        'resolution', 'color_mode', 'file_format', 'tiff_compression',
+        'output_dir',
+        'auto_increment', 'auto_detect', 'scan_counter', 'use_gpu',
+        '_colors', '_notebook', '_tab_builders',
+        'status_label', 'dir_label', 'preview_btn', 'scan_btn', 'batch_btn',
+        'stats_label', 'crop_btn', 'queue_label', 'process_queue_btn',
+        'pause_queue_btn', 'crop_info_label', 'preview_canvas',
+        'preview_label', '_preview_host', '_viewport_wh',
+    )
+
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Film Scanner Pro - Epson V300")
+        self.root.geometry("1400x900")
+        self.root.configure(bg='#2b2b2b')
+        
+        # Scanner variables
+        self.source_manager = None
+        self.scanner = None
+        self.scanner_name = ""
+        self.is_wia = False
+        self.preview_image = None
+        self.preview_image_original = None
+        self._preview_proxy = None
+        self._proxy_l = None
+        self._tkimg = None
+        self._canvas_img_id = None
+        self.scanned_images = []
+        
+        # Image adjustment variables
+        self.brightness = tk.DoubleVar(value=1.0)
+        self.contrast = tk.DoubleVar(value=1.0)
+        self.exposure = tk.DoubleVar(value=0.0)
+        self.invert_negative = tk.BooleanVar(value=False)
+        self.remove_dust = tk.BooleanVar(value=False)
+        self.rotation_angle = tk.IntVar(value=0)
+        self.flip_horizontal = tk.BooleanVar(value=False)
+        self.flip_vertical = tk.BooleanVar(value=False)
+        
+        # Preview redraw coalescing
+        self._preview_after_id = None
+
+        # Viewport size cached by the <Configure> handler
+        self._viewport_wh = None
+
+        # Reusable output buffer for the JIT adjustment kernel
+        self._adjust_buf = None
+
+        # Memoized tone LUT (rebuilt only when a slider value changes)
+        self._tone_lut = None
+
+        # Crop variables
+        self.crop_active = False
+        self.crop_start = None
+        self.crop_end = None
+        self.crop_rect = None
+        
+        # Queue variables
+        self.scan_queue = []
+        self.queue_processing = False
+        self.queue_paused = False
+        # Set while the queue may run; cleared on pause so the worker
+        # blocks in wait() instead of polling twice a second
+        self._queue_resume = threading.Event()
+        self._queue_resume.set()
+
+        # Single background worker for all scanner jobs. TWAIN requires its
+        # handle to stay on one thread, and a persistent worker avoids the
+        # startup cost of spawning a thread per scan.
+        self._job_q = queue.Queue()
+        threading.Thread(target=self._scan_worker, daemon=True).start()
+
+        # Bounded hand-off from the TWAIN acquire loop to CPU post-
+        # processing during queue runs; maxsize=2 gives back-pressure so
+        # long batches don't stack raw scans in memory
+        self._post_q = queue.Queue(maxsize=2)
+        self._post_error = None
+        threading.Thread(target=self._postprocess_worker, daemon=True).start()
+
+        # Process pool for final encodes, created on first save so idle
+        # sessions never spawn worker processes
+        self._encode_pool = None
+
+        # Thread pool for per-frame encodes (Pillow drops the GIL there)
+        self._io_pool = None
+        
+        # GPU offload for full-resolution adjustments (no-op without CuPy/CUDA)
+        self.use_gpu = tk.BooleanVar(value=True)
+
+        # Debug mode and logging
+        self.debug_mode = tk.BooleanVar(value=False)
+        self.setup_logging()
+        
+        # Settings
+        self.resolution = tk.IntVar(value=2400)
+        self.color_mode = tk.StringVar(value="Color")
+        self.file_format = tk.StringVar(value="TIFF")
+        self.tiff_compression = tk.StringVar(value="Deflate")
+        self.output_dir = tk.StringVar(value=str(_SCANS_DIR))
+        self.auto_increment = tk.BooleanVar(value=True)
+        self.auto_detect = tk.BooleanVar(value=True)
+        self.scan_counter = 1
+        
+        self.setup_ui()
+        
+        # Initialize scanner after window is shown
+        self.root.after(100, self.initialize_scanner)
+
+        # Warm up the JIT kernel on a throwaway thread so neither numba
+        # compilation nor the first slider move stalls the UI; it must not
+        # go through root.after (main thread) or _job_q (would delay a
+        # first scan behind seconds of compilation)
+        threading.Thread(target=self._warmup_adjust_kernel, daemon=True).start()
+        
+        # Bind adjustment changes to update preview (debounced - a slider drag
+        # fires dozens of writes per second, only the last redraw matters)
+        self.brightness.trace_add('write', self._schedule_preview_update)
+        self.contrast.trace_add('write', self._schedule_preview_update)
+        self.exposure.trace_add('write', self._schedule_preview_update)
+        self.invert_negative.trace_add('write', self._schedule_preview_update)
+        self.remove_dust.trace_add('write', self._schedule_preview_update)
+        self.color_mode.trace_add('write', self._schedule_preview_update)
+    
+    def setup_ui(self):
+        """Create the user interface"""
+        # Modern color scheme
+        bg_color = '#2b2b2b'
+        fg_color = '#ffffff'
+        accent_color = '#0078d4'
+        panel_color = '#3c3c3c'
+        self._colors = {'bg': bg_color, 'fg': fg_color,
+                        'accent': accent_color, 'panel': panel_color}
+
+        # Style configuration
+        style = ttk.Style()
+        style.theme_use('clam')
+        style.configure('TFrame', background=bg_color)
+        style.configure('TLabel', background=bg_color, foreground=fg_color, font=('Segoe UI', 10))
+        style.configure('TButton', font=('Segoe UI', 10), padding=6)
+        style.configure('Accent.TButton', background=accent_color, foreground='white', font=('Segoe UI', 11, 'bold'))
+
+        # Named styles for panel widgets - Tk parses the colour strings once
+        # per style instead of once per widget at creation
+        style.configure('Panel.TLabel', background=panel_color, foreground=fg_color,
+                        font=('Segoe UI', 10))
+        style.configure('Panel.TCheckbutton', background=panel_color, foreground=fg_color,
+                        font=('Segoe UI', 10))
+        style.map('Panel.TCheckbutton',
+                  background=[('active', panel_color)],
+                  foreground=[('active', fg_color)])
+
+        # tk.Scale has no ttk equivalent with a trough colour, so centralize
+        # its colours through the option database instead of per-widget kwargs
+        self.root.option_add('*Scale.background', panel_color)
+        self.root.option_add('*Scale.foreground', fg_color)
+        self.root.option_add('*Scale.troughColor', '#555555')
+        self.root.option_add('*Scale.highlightThickness', 0)
+        
+        # Main container
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        
+        # Left panel - Controls
+        left_panel = tk.Frame(main_frame, bg=panel_color, width=350)
+        left_panel.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(0, 10))
+        left_panel.grid_propagate(False)
+        
+        # Title
+        title_label = tk.Label(left_panel, text="Film Scanner Pro", font=('Segoe UI', 18, 'bold'),
+                               bg=panel_color, fg=fg_color)
+        title_label.pack(pady=20)
+
+        # Left panel sections live in a notebook whose tabs are built lazily
+        # on first open - constructing all ~50 widgets upfront blocks mainloop
+        # startup. The notebook packs straight into the panel: the old
+        # Canvas+Scrollbar wrapper recomputed canvas.bbox("all") on every
+        # child <Configure>, an O(widgets) cost per widget event, and with
+        # the sections split across tabs each tab fits without scrolling.
+        # The Scan tab is built immediately because initialize_scanner
+        # needs its widgets.
+        self._notebook = ttk.Notebook(left_panel)
+        self._notebook.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        self._tab_builders = {}
+        for name, builder in (("Scan", self._build_scan_tab),
+                              ("Adjust", self._build_adjust_tab),
+                              ("Queue", self._build_queue_tab),
+                              ("Debug", self._build_debug_tab)):
+            tab = tk.Frame(self._notebook, bg=panel_color)
+            self._notebook.add(tab, text=name)
+            self._tab_builders[str(tab)] = (tab, builder)
+
+        self._notebook.bind('<<NotebookTabChanged>>', self._on_tab_changed)
+        self._build_tab(self._notebook.tabs()[0])
+        # Right panel - Preview
+        right_panel = tk.Frame(main_frame, bg=panel_color)
+        right_panel.grid(row=0, column=1, sticky=(tk.W, tk.E, tk.N, tk.S))
+        main_frame.columnconfigure(1, weight=1)
+        main_frame.rowconfigure(0, weight=1)
+        
+        preview_header = tk.Frame(right_panel, bg=panel_color)
+        preview_header.pack(fill=tk.X, pady=10)
+        
+        preview_label = tk.Label(preview_header, text="Preview", font=('Segoe UI', 14, 'bold'),
+                                bg=panel_color, fg=fg_color)
+        preview_label.pack(side=tk.LEFT, padx=20)
+        
+        self.crop_info_label = tk.Label(preview_header, text="", font=('Segoe UI', 9),
+                                        bg=panel_color, fg='#ffa500')
+        self.crop_info_label.pack(side=tk.RIGHT, padx=20)
+        
+        # Preview display - a plain Label hosts the PhotoImage by default;
+        # the Canvas (with its per-item damage tracking and compositing) is
+        # only swapped in while a crop rectangle is being drawn
+        self.preview_label = tk.Label(
+            right_panel, bg='#1a1a1a', fg='#666666',
+            text="No preview available\nClick 'Preview' to see scan preview",
+            font=('Segoe UI', 12), justify=tk.CENTER
+        )
+        self.preview_label.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        self.preview_canvas = tk.Canvas(right_panel, bg='#1a1a1a', highlightthickness=0)
+        self._preview_host = self.preview_label
+
+        # Bind crop events
+        self.preview_canvas.bind("<Button-1>", self.crop_mouse_down)
+        self.preview_canvas.bind("<B1-Motion>", self.crop_mouse_drag)
+        self.preview_canvas.bind("<ButtonRelease-1>", self.crop_mouse_up)
+
+        # Rebuild the preview proxy when the viewport changes size (debounced)
+        self.preview_label.bind("<Configure>", self._on_preview_canvas_resize)
+        self.preview_canvas.bind("<Configure>", self._on_preview_canvas_resize)
+
+    def _build_tab(self, tab_id):
+        """Build a notebook tab's widgets the first time it is needed"""
+        entry = self._tab_builders.pop(str(tab_id), None)
+        if entry:
+            tab, builder = entry
+            builder(tab)
+
+    def _on_tab_changed(self, event):
+        """Lazily construct tab contents on first open"""
+        self._build_tab(self._notebook.select())
+
+    def _build_scan_tab(self, parent):
+        """Build the Scan tab: status, settings, output and action buttons"""
+        fg_color = self._colors['fg']
+        accent_color = self._colors['accent']
+        panel_color = self._colors['panel']
+
+        # Scanner Status
+        status_frame = tk.LabelFrame(parent, text="Scanner Status", bg=panel_color, fg=fg_color,
+                                     font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
+        status_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        self.status_label = tk.Label(status_frame, text="Initializing...", bg=panel_color, fg='#ffa500',
+                                     font=('Segoe UI', 9))
+        self.status_label.pack()
+
+        # Scan Settings
+        settings_frame = tk.LabelFrame(parent, text="Scan Settings", bg=panel_color, fg=fg_color,
+                                       font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
+        settings_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        # Resolution
+        ttk.Label(settings_frame, text="Resolution (DPI):", style='Panel.TLabel').grid(row=0, column=0, sticky=tk.W, pady=5)
+        resolution_combo = ttk.Combobox(settings_frame, textvariable=self.resolution, width=15,
+                                       values=[1200, 2400, 3200, 4800, 6400])
+        resolution_combo.grid(row=0, column=1, pady=5)
+
+        # Color Mode
+        ttk.Label(settings_frame, text="Color Mode:", style='Panel.TLabel').grid(row=1, column=0, sticky=tk.W, pady=5)
+        color_combo = ttk.Combobox(settings_frame, textvariable=self.color_mode, width=15,
+                                   values=["Color", "Grayscale", "Black & White"])
+        color_combo.grid(row=1, column=1, pady=5)
+
+        # File Format
+        ttk.Label(settings_frame, text="File Format:", style='Panel.TLabel').grid(row=2, column=0, sticky=tk.W, pady=5)
+        format_combo = ttk.Combobox(settings_frame, textvariable=self.file_format, width=15,
+                                    values=["TIFF", "PNG", "JPEG"])
+        format_combo.grid(row=2, column=1, pady=5)
+
+        # TIFF Compression
+        ttk.Label(settings_frame, text="TIFF Compression:", style='Panel.TLabel').grid(row=3, column=0, sticky=tk.W, pady=5)
+        compression_combo = ttk.Combobox(settings_frame, textvariable=self.tiff_compression, width=15,
+                                         values=["Deflate", "LZW"])
+        compression_combo.grid(row=3, column=1, pady=5)
+
+        # Output Directory
+        output_frame = tk.LabelFrame(parent, text="Output", bg=panel_color, fg=fg_color,
+                                     font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
+        output_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        ttk.Label(output_frame, text="Save to:", style='Panel.TLabel').pack(anchor=tk.W)
+
+        dir_frame = tk.Frame(output_frame, bg=panel_color)
+        dir_frame.pack(fill=tk.X, pady=5)
+
+        self.dir_label = tk.Label(dir_frame, text=self.output_dir.get()[:30] + "...",
+                                  bg=panel_color, fg='#aaaaaa', anchor=tk.W)
+        self.dir_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        browse_btn = ttk.Button(dir_frame, text="Browse", command=self.browse_directory)
+        browse_btn.pack(side=tk.RIGHT)
+
+        ttk.Checkbutton(output_frame, text="Auto-increment filenames", variable=self.auto_increment,
+                        style='Panel.TCheckbutton').pack(anchor=tk.W, pady=5)
+
+        ttk.Checkbutton(output_frame, text="Auto-detect film frames", variable=self.auto_detect,
+                        style='Panel.TCheckbutton').pack(anchor=tk.W, pady=2)
+
+        # Action Buttons
+        button_frame = tk.Frame(parent, bg=panel_color)
+        button_frame.pack(fill=tk.X, padx=10, pady=20)
+
+        self.preview_btn = tk.Button(button_frame, text="Preview", command=self.preview_scan,
+                                     bg='#555555', fg='white', font=('Segoe UI', 11),
+                                     relief=tk.FLAT, cursor='hand2', padx=20, pady=10)
+        self.preview_btn.pack(fill=tk.X, pady=5)
+
+        self.scan_btn = tk.Button(button_frame, text="Scan", command=self.start_scan,
+                                  bg=accent_color, fg='white', font=('Segoe UI', 12, 'bold'),
+                                  relief=tk.FLAT, cursor='hand2', padx=20, pady=12)
+        self.scan_btn.pack(fill=tk.X, pady=5)
+
+        self.batch_btn = tk.Button(button_frame, text="Batch Scan", command=self.batch_scan,
+                                   bg='#0d6efd', fg='white', font=('Segoe UI', 11),
+                                   relief=tk.FLAT, cursor='hand2', padx=20, pady=10)
+        self.batch_btn.pack(fill=tk.X, pady=5)
+
+        # Statistics
+        stats_frame = tk.LabelFrame(parent, text="Session Info", bg=panel_color, fg=fg_color,
+                                    font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
+        stats_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        self.stats_label = tk.Label(stats_frame, text="Scans completed: 0", bg=panel_color, fg=fg_color)
+        self.stats_label.pack()
+
+    def _build_adjust_tab(self, parent):
+        """Build the Adjust tab: image adjustments and transform controls"""
+        fg_color = self._colors['fg']
+        panel_color = self._colors['panel']
+
+        # Image Adjustments Frame
+        adjust_frame = tk.LabelFrame(parent, text="Image Adjustments", bg=panel_color, fg=fg_color,
+                                     font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
+        adjust_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        # Brightness
+        ttk.Label(adjust_frame, text="Brightness:", style='Panel.TLabel').grid(row=0, column=0, sticky=tk.W, pady=3)
+        brightness_scale = tk.Scale(adjust_frame, from_=0.5, to=2.0, resolution=0.1, orient=tk.HORIZONTAL,
+                                   variable=self.brightness, length=150)
+        brightness_scale.grid(row=0, column=1, pady=3)
+
+        # Contrast
+        ttk.Label(adjust_frame, text="Contrast:", style='Panel.TLabel').grid(row=1, column=0, sticky=tk.W, pady=3)
+        contrast_scale = tk.Scale(adjust_frame, from_=0.5, to=2.0, resolution=0.1, orient=tk.HORIZONTAL,
+                                 variable=self.contrast, length=150)
+        contrast_scale.grid(row=1, column=1, pady=3)
+
+        # Exposure
+        ttk.Label(adjust_frame, text="Exposure:", style='Panel.TLabel').grid(row=2, column=0, sticky=tk.W, pady=3)
+        exposure_scale = tk.Scale(adjust_frame, from_=-1.0, to=1.0, resolution=0.1, orient=tk.HORIZONTAL,
+                                 variable=self.exposure, length=150)
+        exposure_scale.grid(row=2, column=1, pady=3)
+
+        # Negative Inversion
+        ttk.Checkbutton(adjust_frame, text="Invert Negative", variable=self.invert_negative,
+                        style='Panel.TCheckbutton').grid(row=3, column=0, columnspan=2, sticky=tk.W, pady=3)
+
+        # Dust Removal
+        ttk.Checkbutton(adjust_frame, text="Remove Dust/Scratches", variable=self.remove_dust,
+                        style='Panel.TCheckbutton').grid(row=4, column=0, columnspan=2, sticky=tk.W, pady=3)
+
+        # Reset button
+        reset_btn = tk.Button(adjust_frame, text="Reset All", command=self.reset_adjustments,
+                             bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2')
+        reset_btn.grid(row=5, column=0, columnspan=2, pady=5)
+
+        # Transform Frame
+        transform_frame = tk.LabelFrame(parent, text="Transform", bg=panel_color, fg=fg_color,
+                                       font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
+        transform_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        # Rotation buttons
+        rotate_frame = tk.Frame(transform_frame, bg=panel_color)
+        rotate_frame.pack(fill=tk.X, pady=5)
+
+        tk.Button(rotate_frame, text="⟲ 90°", command=lambda: self.rotate_image(-90),
+                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2', width=8).pack(side=tk.LEFT, padx=2)
+        tk.Button(rotate_frame, text="⟳ 90°", command=lambda: self.rotate_image(90),
+                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2', width=8).pack(side=tk.LEFT, padx=2)
+        tk.Button(rotate_frame, text="180°", command=lambda: self.rotate_image(180),
+                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2', width=8).pack(side=tk.LEFT, padx=2)
+
+        # Flip buttons
+        flip_frame = tk.Frame(transform_frame, bg=panel_color)
+        flip_frame.pack(fill=tk.X, pady=5)
+
+        tk.Button(flip_frame, text="Flip H", command=self.flip_h,
+                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2', width=12).pack(side=tk.LEFT, padx=2)
+        tk.Button(flip_frame, text="Flip V", command=self.flip_v,
+                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2', width=12).pack(side=tk.LEFT, padx=2)
+
+        # Crop button
+        self.crop_btn = tk.Button(transform_frame, text="✂ Crop Selection", command=self.toggle_crop_mode,
+                                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2')
+        self.crop_btn.pack(fill=tk.X, pady=5)
+
+    def _build_queue_tab(self, parent):
+        """Build the Queue tab: queue controls and status"""
+        fg_color = self._colors['fg']
+        panel_color = self._colors['panel']
+
+        # Queue Frame
+        queue_frame = tk.LabelFrame(parent, text="Scan Queue", bg=panel_color, fg=fg_color,
+                                    font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
+        queue_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        queue_btn_frame = tk.Frame(queue_frame, bg=panel_color)
+        queue_btn_frame.pack(fill=tk.X, pady=5)
+
+        tk.Button(queue_btn_frame, text="Add to Queue", command=self.add_to_queue,
+                 bg='#6c757d', fg='white', relief=tk.FLAT, cursor='hand2', width=12).pack(side=tk.LEFT, padx=2)
+        tk.Button(queue_btn_frame, text="Clear Queue", command=self.clear_queue,
+                 bg='#dc3545', fg='white', relief=tk.FLAT, cursor='hand2', width=12).pack(side=tk.LEFT, padx=2)
+
+        self.queue_label = tk.Label(queue_frame, text="Queue: 0 scans", bg=panel_color, fg=fg_color,
+                                    font=('Segoe UI', 9))
+        self.queue_label.pack(pady=5)
+
+        self.process_queue_btn = tk.Button(queue_frame, text="▶ Process Queue", command=self.process_queue,
+                                          bg='#28a745', fg='white', font=('Segoe UI', 10, 'bold'),
+                                          relief=tk.FLAT, cursor='hand2')
+        self.process_queue_btn.pack(fill=tk.X, pady=5)
+
+        self.pause_queue_btn = tk.Button(queue_frame, text="⏸ Pause Queue", command=self.toggle_pause_queue,
+                                        bg='#ffc107', fg='black', font=('Segoe UI', 9),
+                                        relief=tk.FLAT, cursor='hand2', state=tk.DISABLED)
+        self.pause_queue_btn.pack(fill=tk.X, pady=2)
+        self.update_queue_display()
+
+    def _build_debug_tab(self, parent):
+        """Build the Debug tab: debug mode and diagnostics"""
+        fg_color = self._colors['fg']
+        panel_color = self._colors['panel']
+
+        # Debug Frame
+        debug_frame = tk.LabelFrame(parent, text="Debug Tools", bg=panel_color, fg=fg_color,
+                                    font=('Segoe UI', 10, 'bold'), padx=10, pady=10)
+        debug_frame.pack(fill=tk.X, padx=10, pady=10)
+
+        ttk.Checkbutton(debug_frame, text="Enable Debug Mode", variable=self.debug_mode,
+                        command=self.toggle_debug_mode,
+                        style='Panel.TCheckbutton').pack(anchor=tk.W, pady=3)
+
+        ttk.Checkbutton(debug_frame, text="Use GPU for large images (CuPy)",
+                        variable=self.use_gpu,
+                        style='Panel.TCheckbutton').pack(anchor=tk.W, pady=3)
+
+        tk.Button(debug_frame, text="View Error Log", command=self.show_error_log,
+                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2').pack(fill=tk.X, pady=2)
+
+        tk.Button(debug_frame, text="Test Connection", command=self.test_scanner_connection,
+                 bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2').pack(fill=tk.X, pady=2)
+
+    def reset_adjustments(self):
+        """Reset all image adjustments to default"""
+        self.brightness.set(1.0)
+        self.contrast.set(1.0)
+        self.exposure.set(0.0)
+        self.invert_negative.set(False)
+        self.remove_dust.set(False)
+        self.rotation_angle.set(0)
+        self.flip_horizontal.set(False)
+        self.flip_vertical.set(False)
+        self._schedule_preview_update()
+    
+    def setup_logging(self):
+        """Setup logging system"""
+        log_dir = str(_LOG_DIR)
+        os.makedirs(log_dir, exist_ok=True)
+        
+        log_file = os.path.join(log_dir, f"scanner_log_{datetime.now().strftime('%Y%m%d')}.log")
+
+        # Records go through an in-memory queue drained by a listener thread,
+        # so logger calls in the scan hot path never wait on disk writes
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        self._file_handler = logging.FileHandler(log_file)
+        self._file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter)
+
+        log_q = queue.Queue(-1)
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.INFO)
+        root_logger.addHandler(logging.handlers.QueueHandler(log_q))
+
+        self._log_listener = logging.handlers.QueueListener(
+            log_q, self._file_handler, stream_handler)
+        self._log_listener.start()
+
+        self.logger = logging.getLogger(__name__)
+        self.logger.info("Film Scanner Pro started")
+        self.log_file = log_file
+        self._log_pos = 0  # File offset for incremental log-viewer reads
+    
+    def toggle_debug_mode(self):
+        """Toggle debug mode"""
+        if self.debug_mode.get():
+            self.logger.setLevel(logging.DEBUG)
+            self.logger.debug("Debug mode enabled")
+            messagebox.showinfo("Debug Mode", "Debug mode enabled\nDetailed logs will be saved")
+        else:
+            self.logger.setLevel(logging.INFO)
+            self.logger.info("Debug mode disabled")
+    
+    def show_error_log(self):
+        """Show error log in a window"""
+        try:
+            self._file_handler.flush()
+            with open(self.log_file, 'r') as f:
+                log_content = f.read()
+                self._log_pos = f.tell()
+
+            log_window = tk.Toplevel(self.root)
+            log_window.title("Error Log")
+            log_window.geometry("800x600")
+            log_window.configure(bg='#2b2b2b')
+            
+            text_frame = tk.Frame(log_window, bg='#2b2b2b')
+            text_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            
+            scrollbar = tk.Scrollbar(text_frame)
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            
+            text_widget = tk.Text(text_frame, wrap=tk.WORD, bg='#1a1a1a', fg='#00ff00',
+                                 font=('Consolas', 9), yscrollcommand=scrollbar.set)
+            text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+            scrollbar.config(command=text_widget.yview)
+            
+            text_widget.insert(tk.END, log_content)
+            text_widget.config(state=tk.DISABLED)
+            
+            # Add buttons
+            btn_frame = tk.Frame(log_window, bg='#2b2b2b')
+            btn_frame.pack(fill=tk.X, padx=10, pady=5)
+            
+            tk.Button(btn_frame, text="Refresh", command=lambda: self.refresh_log(text_widget),
+                     bg='#555555', fg='white', relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
+            tk.Button(btn_frame, text="Clear Log", command=lambda: self.clear_log(text_widget),
+                     bg='#dc3545', fg='white', relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
+            tk.Button(btn_frame, text="Open Log File", command=self.open_log_file,
+                     bg='#0078d4', fg='white', relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
+        
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not open log file:\n{str(e)}")
+    
+    def refresh_log(self, text_widget):
+        """Append log content written since the last read
+
+        Only the bytes past the remembered file offset are read and
+        inserted, so refreshing stays O(new content) instead of re-reading
+        and re-inserting the whole log file.
+        """
+        try:
+            self._file_handler.flush()
+            with open(self.log_file, 'r') as f:
+                f.seek(self._log_pos)
+                chunk = f.read()
+                self._log_pos = f.tell()
+            if chunk:
+                text_widget.config(state=tk.NORMAL)
+                text_widget.insert(tk.END, chunk)
+                text_widget.config(state=tk.DISABLED)
+                text_widget.see(tk.END)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not refresh log:\n{str(e)}")
+
+    def clear_log(self, text_widget):
+        """Clear log file"""
+        if messagebox.askyesno("Clear Log", "Clear all log entries?"):
+            try:
+                with open(self.log_file, 'w') as f:
+                    f.write(f"Log cleared at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+                self._log_pos = 0
+                text_widget.config(state=tk.NORMAL)
+                text_widget.delete(1.0, tk.END)
+                text_widget.config(state=tk.DISABLED)
+                self.refresh_log(text_widget)
+                self.logger.info("Log file cleared by user")
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not clear log:\n{str(e)}")
+    
+    def open_log_file(self):
+        """Open log file in default text editor"""
+        try:
+            os.startfile(self.log_file)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not open log file:\n{str(e)}")
+    
+    def test_scanner_connection(self):
+        """Test scanner connection and capabilities"""
+        if not TWAIN_AVAILABLE:
+            messagebox.showwarning("TWAIN Not Available", "Cannot test connection: TWAIN library not installed")
+            return
+        
+        try:
+            result = "Scanner Connection Test\n" + "="*40 + "\n\n"
+            
+            if self.source_manager:
+                result += "✓ TWAIN Source Manager: OK\n"
+                sources = self.source_manager.GetSourceList()
+                result += f"✓ Available scanners: {len(sources)}\n"
+                for i, source in enumerate(sources, 1):
+                    result += f"  {i}. {source}\n"
+            else:
+                result += "✗ TWAIN Source Manager: Not initialized\n"
+            
+            if self.scanner:
+                result += "\n✓ Scanner connection: OK\n"
+                result += f"  Scanner ready for operation\n"
+            else:
+                result += "\n✗ Scanner connection: Not connected\n"
+            
+            result += f"\n✓ Image library (Pillow): OK\n"
+            result += f"✓ NumPy (frame detection): OK\n"
+            result += f"\nOutput directory: {self.output_dir.get()}\n"
+            
+            if os.path.exists(self.output_dir.get()):
+                result += "✓ Output directory exists\n"
+            else:
+                result += "✗ Output directory does not exist (will be created)\n"
+            
+            messagebox.showinfo("Connection Test", result)
+            self.logger.info("Scanner connection test performed")
+            
+        except Exception as e:
+            error_msg = f"Connection test failed:\n{str(e)}\n\n{traceback.format_exc()}"
+            messagebox.showerror("Test Failed", error_msg)
+            self.logger.error(f"Connection test failed: {str(e)}")
+    
+    def rotate_image(self, angle):
+        """Rotate preview image"""
+        if not self.preview_image_original:
+            return
+        
+        current = self.rotation_angle.get()
+        self.rotation_angle.set((current + angle) % 360)
+        self._schedule_preview_update()
+    
+    def flip_h(self):
+        """Flip image horizontally"""
+        self.flip_horizontal.set(not self.flip_horizontal.get())
+        self._schedule_preview_update()
+    
+    def flip_v(self):
+        """Flip image vertically"""
+        self.flip_vertical.set(not self.flip_vertical.get())
+        self._schedule_preview_update()
+    
+    def toggle_crop_mode(self):
+        """Toggle crop selection mode"""
+        self.crop_active = not self.crop_active
+        if self.crop_active:
+            self.crop_btn.config(bg='#00ff00', text="✓ Crop Active - Draw Rectangle")
+            self.crop_info_label.config(text="Draw rectangle to select crop area")
+            # Swap the Canvas in for the crop rectangle; it takes over the
+            # Label's slot so the viewport geometry is unchanged
+            self.preview_label.pack_forget()
+            self.preview_canvas.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+            self._preview_host = self.preview_canvas
+            self.preview_canvas.update_idletasks()
+            if self._tkimg is not None:
+                self._show_on_canvas()
+        else:
+            self.crop_btn.config(bg='#555555', text="✂ Crop Selection")
+            self.crop_info_label.config(text="")
+            if self.crop_rect:
+                self.preview_canvas.delete(self.crop_rect)
+                self.crop_rect = None
+            self.crop_start = None
+            self.crop_end = None
+            # Back to the cheap Label host for plain display
+            self.preview_canvas.pack_forget()
+            self.preview_label.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+            self._preview_host = self.preview_label
+    
+    def crop_mouse_down(self, event):
+        """Handle crop selection start"""
+        if not self.crop_active:
+            return
+        self.crop_start = (event.x, event.y)
+        # Create the rectangle once; dragging just moves its coordinates.
+        # Deleting and recreating the item per motion event forces Tk to
+        # redamage the canvas and recomposite the image underneath.
+        if self.crop_rect:
+            self.preview_canvas.coords(self.crop_rect, event.x, event.y, event.x, event.y)
+        else:
+            self.crop_rect = self.preview_canvas.create_rectangle(
+                event.x, event.y, event.x, event.y, outline='#00ff00', width=2
+            )
+
+    def crop_mouse_drag(self, event):
+        """Handle crop selection drag"""
+        if not self.crop_active or not self.crop_start:
+            return
+
+        x0, y0 = self.crop_start
+        self.preview_canvas.coords(self.crop_rect, x0, y0, event.x, event.y)
+    
+    def crop_mouse_up(self, event):
+        """Handle crop selection end"""
+        if not self.crop_active or not self.crop_start:
+            return
+        
+        self.crop_end = (event.x, event.y)
+        self.apply_crop()
+    
+    def apply_crop(self):
+        """Apply crop to the preview image"""
+        if not self.preview_image_original or not self.crop_start or not self.crop_end:
+            return
+        
+        # Get canvas and image dimensions
+        canvas_width = self.preview_canvas.winfo_width()
+        canvas_height = self.preview_canvas.winfo_height()
+        
+        # Convert canvas coordinates to image coordinates
+        img = self.preview_image_original
+        
+        # Calculate the displayed image size on canvas
+        img_ratio = img.width / img.height
+        canvas_ratio = canvas_width / canvas_height
+        
+        if img_ratio > canvas_ratio:
+            display_width = canvas_width - 40
+            display_height = int(display_width / img_ratio)
+        else:
+            display_height = canvas_height - 40
+            display_width = int(display_height * img_ratio)
+        
+        # Calculate offset (image is centered)
+        offset_x = (canvas_width - display_width) // 2
+        offset_y = (canvas_height - display_height) // 2
+        
+        # Convert crop coordinates: shift out the canvas offset, scale to
+        # image space, then sort/clip both corners in one vector operation
+        coords = np.array([self.crop_start, self.crop_end], dtype=np.float64)
+        coords -= (offset_x, offset_y)
+        coords *= (img.width / display_width, img.height / display_height)
+        (x1, y1), (x2, y2) = np.clip(np.sort(coords, axis=0), 0,
+                                     (img.width, img.height)).astype(int)
+        
+        if x2 - x1 > 10 and y2 - y1 > 10:  # Minimum crop size
+            self.set_preview(img.crop((x1, y1, x2, y2)))
+            self._schedule_preview_update()
+            self.toggle_crop_mode()  # Exit crop mode
+            messagebox.showinfo("Crop Applied", "Crop has been applied to the preview")
+    
+    def set_preview(self, img):
+        """Set a new preview source image and rebuild the downscaled proxy"""
+        self.preview_image_original = img
+        self._preview_proxy = None
+        if img is not None:
+            self._rebuild_preview_proxy()
+
+    def _rebuild_preview_proxy(self):
+        """Recompute the canvas-sized proxy used for live adjustments
+
+        The full scan is tens of megapixels at 2400+ DPI but only ever
+        displayed at canvas size, so live slider adjustments run against
+        this small proxy; the full-resolution image is only processed on
+        the final save path.
+        """
+        img = self.preview_image_original
+        if not img:
+            self._preview_proxy = None
+            return
+
+        canvas_width, canvas_height = self._viewport_size()
+
+        if canvas_width < 100:  # Viewport not initialized yet
+            canvas_width = 800
+            canvas_height = 600
+
+        img_ratio = img.width / img.height
+        canvas_ratio = canvas_width / canvas_height
+
+        if img_ratio > canvas_ratio:
+            new_width = canvas_width - 40
+            new_height = int(new_width / img_ratio)
+        else:
+            new_height = canvas_height - 40
+            new_width = int(new_height * img_ratio)
+
+        self._preview_proxy = img.resize((max(1, new_width), max(1, new_height)),
+                                         Image.Resampling.BILINEAR)
+        self._proxy_l = None
+
+    def _on_preview_canvas_resize(self, event):
+        """Cache the viewport size and invalidate the preview proxy on resize"""
+        self._viewport_wh = (event.width, event.height)
+        if self.preview_image_original:
+            self._preview_proxy = None
+            self._schedule_preview_update()
+
+    def _viewport_size(self):
+        """Return the preview viewport size without a Tk round trip
+
+        The <Configure> handler keeps the size cached; winfo_* calls into
+        the Tcl interpreter are only needed before the first event.
+        """
+        if self._viewport_wh:
+            return self._viewport_wh
+        return (self._preview_host.winfo_width(),
+                self._preview_host.winfo_height())
+
+    def _schedule_preview_update(self, *args):
+        """Coalesce rapid adjustment changes into a single deferred redraw"""
+        if self._preview_after_id:
+            self.root.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.root.after(30, self._run_preview_update)
+
+    def _run_preview_update(self):
+        """Run the deferred preview redraw scheduled by _schedule_preview_update"""
+        self._preview_after_id = None
+        self.update_preview_adjustments()
+
+    def update_preview_adjustments(self, *args):
+        """Update preview with current adjustments"""
+        if not self.preview_image_original:
+            return
+
+        if self._preview_proxy is None:
+            self._rebuild_preview_proxy()
+        img = self._preview_proxy
+
+        # Non-color modes run the whole pipeline single-channel, a third of
+        # the per-pixel work of staying in RGB; the grayscale proxy is
+        # cached alongside the RGB one
+        mode = self.color_mode.get()
+        if mode != "Color" and img.mode != 'L':
+            if self._proxy_l is None:
+                self._proxy_l = img.convert('L')
+            img = self._proxy_l
+
+        # Run the shared rotate/flip/adjust pipeline
+        img = self._pipeline(img)
+
+        if mode == "Black & White":
+            arr = np.asarray(img)
+            img = Image.fromarray((arr > 127).astype(np.uint8) * 255)
+
+        self.preview_image = img
+        self.display_preview(img)
+
+    def _pipeline(self, img):
+        """Rotate/flip/adjust chain shared by the preview and save paths
+
+        The UI only produces 90-degree rotations, so rot90/flip give
+        zero-copy stride views and all combined transforms materialize in
+        a single contiguous copy instead of one full PIL pass per
+        rotate/mirror/flip. Keeping one implementation means LUT caching,
+        buffer reuse and the GPU path apply to both callers.
+        """
+        angle = self.rotation_angle.get() % 360
+        if angle % 90 == 0:
+            if angle or self.flip_horizontal.get() or self.flip_vertical.get():
+                arr = np.asarray(img)
+                if angle:
+                    arr = np.rot90(arr, k=-(angle // 90))
+                if self.flip_horizontal.get():
+                    arr = arr[:, ::-1]
+                if self.flip_vertical.get():
+                    arr = arr[::-1, :]
+                img = Image.fromarray(np.ascontiguousarray(arr))
+        else:
+            if angle:
+                img = img.rotate(-angle, expand=True)
+            # transpose() is what ImageOps.mirror/flip wrap; a 180 rotation
+            # covers the both-flips combo in a single pass
+            if self.flip_horizontal.get() and self.flip_vertical.get():
+                img = img.transpose(Image.Transpose.ROTATE_180)
+            elif self.flip_horizontal.get():
+                img = img.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+            elif self.flip_vertical.get():
+                img = img.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+
+        return self.apply_adjustments(img)
+
+    def apply_adjustments(self, image):
+        """Apply all image adjustments"""
+        try:
+            img = image
+
+            brightness = self.brightness.get()
+            contrast = self.contrast.get()
+            exposure = self.exposure.get()
+            invert = self.invert_negative.get()
+
+            # Brightness, contrast, exposure and inversion are all linear in the
+            # pixel value, so fuse them into a single gain/bias pass over one
+            # NumPy buffer instead of chaining ImageEnhance steps (each of which
+            # allocates a new full-resolution image):
+            #   out = clip(pixel * gain + bias), contrast pivoting around 128
+            exposure_factor = 1.0 + exposure
+            gain = brightness * contrast * exposure_factor
+            bias = 128.0 * (1.0 - contrast) * exposure_factor
+            needs_tone = brightness != 1.0 or contrast != 1.0 or exposure != 0.0 or invert
+
+            # Full-resolution saves are bandwidth-bound on the CPU; push the
+            # whole pipeline through the GPU in one upload/download round trip
+            # when one is available. Viewport-sized previews stay on the CPU.
+            if ((needs_tone or self.remove_dust.get())
+                    and self.use_gpu.get()
+                    and img.width * img.height >= _GPU_MIN_PIXELS):
+                gpu_img = self._apply_adjustments_gpu(img, gain, bias, invert, needs_tone)
+                if gpu_img is not None:
+                    return gpu_img
+
+            if needs_tone:
+                src = np.asarray(img)
+                out = self._get_adjust_buffer(src.shape)
+                kernel = _load_adjust_kernel()
+                if kernel is not None:
+                    kernel(src, out, gain, bias, invert)
+                else:
+                    # The fused op is a pointwise function of a byte, so
+                    # collapse it into a 256-entry LUT and apply with one
+                    # gather pass - no float math over the image at all
+                    lut = self._build_tone_lut(gain, bias, invert)
+                    np.take(lut, src, out=out)
+
+                img = self._image_from_buffer(out)
+
+            # Dust/scratch removal (despeckle)
+            if self.remove_dust.get():
+                img = self._remove_dust_filter(img)
+
+            return img
+
+        except Exception as e:
+            self.logger.error(f"Error applying adjustments: {str(e)}")
+            messagebox.showwarning("Adjustment Error", 
+                f"Could not apply some adjustments:\n{str(e)}\n\nUsing original image.")
+            return image
+    
+    def _scan_worker(self):
+        """Run scanner jobs from the job queue on a single background thread"""
+        while True:
+            job = self._job_q.get()
+            try:
+                job()
+            except Exception as e:
+                self.logger.error(f"Scan worker job failed: {str(e)}\n{traceback.format_exc()}")
+            finally:
+                self._job_q.task_done()
+
+    def _postprocess_worker(self):
+        """Transform and save queued scans handed off by the acquire loop
+
+        Runs on its own thread so the scanner can acquire the next film
+        strip while the previous one is still being processed.
+        """
+        while True:
+            image, queue_item = self._post_q.get()
+            try:
+                self._postprocess_queue_item(image, queue_item)
+            except Exception as e:
+                self.logger.error(f"Queue post-processing failed: {str(e)}\n{traceback.format_exc()}")
+                # Keep the first failure; _process_queue_thread reports it
+                # once the hand-off queue has drained
+                if self._post_error is None:
+                    self._post_error = str(e)
+            finally:
+                self._post_q.task_done()
+
+    def _build_tone_lut(self, gain, bias, invert):
+        """Compose the linear tone adjustments into a 256-entry uint8 LUT
+
+        Memoized on the slider values so redraws triggered by flips,
+        rotations or crops don't rebuild an identical table.
+        """
+        key = (gain, bias, invert)
+        # Key and table live in one attribute so the preview thread and
+        # the queue post-process thread can't observe a half-updated
+        # cache; work on locals and publish with a single assignment
+        cached = self._tone_lut
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        x = np.arange(256, dtype=np.float32)
+        y = np.clip(x * gain + bias, 0, 255)
+        if invert:
+            y = 255.0 - y
+        lut = y.astype(np.uint8)
+        self._tone_lut = (key, lut)
+        return lut
+
+    def _get_adjust_buffer(self, shape):
+        """Return the reusable adjustment output buffer, reallocating on shape change"""
+        if self._adjust_buf is None or self._adjust_buf.shape != shape:
+            self._adjust_buf = np.empty(shape, dtype=np.uint8)
+        return self._adjust_buf
+
+    def _image_from_buffer(self, arr):
+        """Wrap a uint8 ndarray in a PIL image without an extra copy
+
+        Image.frombuffer with the raw decoder shares the array's memory
+        where PIL supports it, so the kernel output buffer feeds straight
+        through to the Tk upload. The buffer is kept alive on self
+        (_adjust_buf) for the lifetime of the displayed image.
+        """
+        height, width = arr.shape[:2]
+        mode = 'L' if arr.ndim == 2 else 'RGB'
+        return Image.frombuffer(mode, (width, height), arr, 'raw', mode, 0, 1)
+
+    def _warmup_adjust_kernel(self):
+        """Run the JIT kernel once on a dummy image to absorb compile cost"""
+        kernel = _load_adjust_kernel()
+        if kernel is not None:
+            dummy = np.zeros((16, 16, 3), dtype=np.uint8)
+            kernel(dummy, np.empty_like(dummy), 1.0, 0.0, False)
+
+    def _remove_dust_filter(self, img):
+        """Remove dust/scratches using OpenCV when available, PIL otherwise
+
+        cv2.medianBlur runs a SIMD sorting-network median and handles both
+        grayscale and RGB uint8 at ksize=3, so one call covers every mode;
+        PIL's scalar MedianFilter is only the fallback.
+        """
+        cv2 = _load_cv2()
+        if cv2 is not None:
+            return Image.fromarray(cv2.medianBlur(np.asarray(img), 3))
+        return img.filter(_get_median3())
+
+    def _apply_adjustments_gpu(self, img, gain, bias, invert, needs_tone):
+        """Run the tone LUT and dust median on the GPU for large images
+
+        Uploads the image once, runs every pass in device memory and
+        downloads once. Returns None when CuPy/CUDA is unavailable or the
+        GPU path fails, so the caller falls back to the CPU pipeline.
+        """
+        cp = _load_cupy()
+        if cp is None:
+            return None
+        try:
+            a = cp.asarray(np.asarray(img))
+            if needs_tone:
+                lut = cp.asarray(self._build_tone_lut(gain, bias, invert))
+                a = cp.take(lut, a)
+            if self.remove_dust.get():
+                from cupyx.scipy import ndimage as cp_ndimage
+                size = (3, 3, 1) if a.ndim == 3 else 3
+                a = cp_ndimage.median_filter(a, size=size)
+            return Image.fromarray(cp.asnumpy(a))
+        except Exception as e:
+            self.logger.error(f"GPU adjustment failed, using CPU path: {str(e)}")
+            return None
+
+    def initialize_scanner(self):
+        """Initialize connection to scanner"""
+        if not TWAIN_AVAILABLE:
+            self.status_label.config(text="TWAIN not available - Install python-twain", fg='#ff4444')
+            self.logger.error("TWAIN library not available")
+            messagebox.showwarning("TWAIN Not Available",
+                                 "Python TWAIN library not installed.\n\n"
+                                 "To use this scanner application, please install:\n"
+                                 "pip install pytwain\n\n"
+                                 "For now, you can test the interface in demo mode.")
+            self.scan_btn.config(state=tk.DISABLED)
+            self.preview_btn.config(state=tk.DISABLED)
+            self.batch_btn.config(state=tk.DISABLED)
+            return
+        
+        # Try multiple initialization methods
+        methods = [
+            ("Standard TWAIN DSM", lambda: self._init_standard_twain()),
+            ("Legacy TWAIN 32-bit", lambda: self._init_legacy_twain()),
+            ("WIA fallback", lambda: self._init_wia_fallback())
+        ]
+        
+        for method_name, method in methods:
+            try:
+                self.logger.info(f"Trying initialization method: {method_name}")
+                if method():
+                    return
+            except Exception as e:
+                self.logger.warning(f"{method_name} failed: {str(e)}")
+                continue
+        
+        # All methods failed
+        error_msg = "Could not connect to scanner using any method.\n\n" + \
+                   "The scanner is detected but fails to open.\n" + \
+                   "This is a known issue with some Epson TWAIN drivers.\n\n" + \
+                   "Try this fix:\n" + \
+                   "1. Open PowerShell and run:\n" + \
+                   "   python -m pip install pywin32\n\n" + \
+                   "2. Restart this app\n\n" + \
+                   "This will enable WIA support which works better\n" + \
+                   "with Epson scanners than TWAIN.\n\n" + \
+                   "The app will work in demo mode for now."
+        
+        self.status_label.config(text="Scanner not available", fg='#ff4444')
+        self.logger.error("All scanner initialization methods failed")
+        messagebox.showwarning("Scanner Not Available", error_msg)
+        self.scan_btn.config(state=tk.DISABLED)
+        self.preview_btn.config(state=tk.DISABLED)
+        self.batch_btn.config(state=tk.DISABLED)
+    
+    def _init_standard_twain(self):
+        """Try standard TWAIN initialization"""
+        self.logger.info("Attempting standard TWAIN initialization...")
+        
+        # Ensure window is ready
+        self.root.update_idletasks()
+        
+        # Get proper window handle for TWAIN
+        import ctypes
+        hwnd = int(self.root.wm_frame(), 16)
+        
+        self.source_manager = twain.SourceManager(hwnd)
+        sources = self.source_manager.GetSourceList()
+        
+        if not sources:
+            raise Exception("No scanners detected")
+        
+        self.logger.info(f"Found {len(sources)} scanner(s): {sources}")
+        
+        # Reorder sources: AVOID WIA for film scanning, prefer native TWAIN
+        # Native TWAIN drivers support transparency/film settings better
+        ordered_sources = []
+        for source in sources:
+            if 'WIA-' not in source:
+                # Prefer V300 over V370 if both present
+                if 'V30/V300' in source:
+                    ordered_sources.insert(0, source)  # V300 at front
+                else:
+                    ordered_sources.append(source)
+        
+        # Add WIA as last resort
+        for source in sources:
+            if 'WIA-' in source:
+                ordered_sources.append(source)
+        
+        # Try each scanner until one works
+        last_error = None
+        for scanner_name in ordered_sources:
+            try:
+                self.logger.info(f"Trying to open: {scanner_name}")
+                self.scanner = self.source_manager.OpenSource(scanner_name)
+                self.scanner_name = scanner_name  # Store for WIA detection
+                self.is_wia = 'WIA-' in scanner_name
+                self.status_label.config(text=f"Connected: {scanner_name}", fg='#00ff00')
+                self.logger.info(f"Successfully connected to scanner: {scanner_name}")
+                return True
+            except Exception as e:
+                self.logger.warning(f"Failed to open {scanner_name}: {str(e)}")
+                last_error = e
+                continue
+        
+        # All scanners failed
+        raise Exception(f"Could not open any scanner. Last error: {last_error}")
+    
+    def _init_legacy_twain(self):
+        """Try legacy TWAIN with window handle"""
+        self.logger.info("Attempting legacy TWAIN initialization...")
+        import ctypes
+        
+        # Ensure window is visible and focused
+        self.root.update_idletasks()
+        self.root.focus_force()
+        self.root.after(100)  # Small delay for window to be ready
+        self.root.update_idletasks()
+        
+        # Get window handle
+        hwnd = int(self.root.wm_frame(), 16)  # Convert Tk window to hwnd
+        self.logger.info(f"Using window handle: {hwnd}")
+        
+        self.source_manager = twain.SourceManager(hwnd)
+        sources = self.source_manager.GetSourceList()
+        
+        if not sources:
+            raise Exception("No scanners detected")
+        
+        self.logger.info(f"Found {len(sources)} scanner(s): {sources}")
+        
+        # Reorder sources: AVOID WIA for film scanning, prefer native TWAIN
+        ordered_sources = []
+        for source in sources:
+            if 'WIA-' not in source:
+                if 'V30/V300' in source:
+                    ordered_sources.insert(0, source)  # V300 first
+                else:
+                    ordered_sources.append(source)
+        
+        # Add WIA as last resort
+        for source in sources:
+            if 'WIA-' in source:
+                ordered_sources.append(source)
+        
+        # Try each scanner until one works
+        last_error = None
+        for scanner_name in ordered_sources:
+            try:
+                self.logger.info(f"Trying to open: {scanner_name}")
+                self.scanner = self.source_manager.OpenSource(scanner_name)
+                self.scanner_name = scanner_name
+                self.is_wia = 'WIA-' in scanner_name
+                
+                self.status_label.config(text=f"Connected: {scanner_name}", fg='#00ff00')
+                self.logger.info(f"Legacy TWAIN connected: {scanner_name}")
+                return True
+            except Exception as e:
+                self.logger.warning(f"Failed to open {scanner_name}: {str(e)}")
+                last_error = e
+                continue
+        
+        # All scanners failed
+        raise Exception(f"Could not open any scanner. Last error: {last_error}")
+    
+    def _init_wia_fallback(self):
+        """Try WIA as fallback (Windows Image Acquisition)"""
+        self.logger.info("Attempting WIA fallback...")
+        try:
+            import win32com.client
+            wia = win32com.client.Dispatch("WIA.DeviceManager")
+            devices = wia.DeviceInfos
+            
+            if devices.Count == 0:
+                raise Exception("No WIA devices found")
+            
+            device_name = devices[1].Properties("Name").Value
+            self.logger.info(f"Found WIA device: {device_name}")
+            self.status_label.config(text=f"Connected (WIA): {device_name}", fg='#00ff00')
+            
+            # Store WIA device for later use
+            self.wia_device = wia.DeviceInfos[1].Connect()
+            self.scanner = None  # Mark as WIA mode
+            return True
+        except ImportError:
+            self.logger.warning("WIA not available (pywin32 not installed)")
+            return False
+        except Exception as e:
+            self.logger.warning(f"WIA initialization failed: {str(e)}")
+            return False
+    
+    def browse_directory(self):
+        """Browse for output directory"""
+        try:
+            initial_dir = self.output_dir.get() if os.path.exists(self.output_dir.get()) else os.path.expanduser("~")
+            directory = filedialog.askdirectory(initialdir=initial_dir)
+            
+            if directory:
+                # Validate directory is writable
+                test_file = os.path.join(directory, ".scanner_test")
+                try:
+                    with open(test_file, 'w') as f:
+                        f.write("test")
+                    os.remove(test_file)
+                    
+                    self.output_dir.set(directory)
+                    self.dir_label.config(text=directory[:30] + "...")
+                    self.logger.info(f"Output directory changed to: {directory}")
+                    
+                except PermissionError:
+                    messagebox.showerror("Permission Error", 
+                                       f"Cannot write to directory:\n{directory}\n\nPlease choose a different location.")
+                    self.logger.error(f"Permission denied for directory: {directory}")
+                    
+        except Exception as e:
+            messagebox.showerror("Error", f"Error selecting directory:\n{str(e)}")
+            self.logger.error(f"Directory selection error: {str(e)}")
+    
+    def preview_scan(self):
+        """Show preview of scan"""
+        if not TWAIN_AVAILABLE or not self.scanner:
+            messagebox.showinfo("Demo Mode", "Preview would show here when scanner is connected")
+            return
+        
+        self.status_label.config(text="Generating preview...", fg='#ffa500')
+        
+        # WIA scanners need UI on main thread
+        if self.is_wia or 'WIA-' in self.scanner_name:
+            self._do_preview()
+        else:
+            self._job_q.put(self._do_preview)
+    
+    def _do_preview(self):
+        """Perform preview scan in background thread"""
+        try:
+            self.logger.info("Starting preview scan...")
+            self.logger.info(f"Scanner: {self.scanner_name}, is_wia: {self.is_wia}")
+            
+            if not self.scanner:
+                raise Exception("Scanner not initialized")
+            
+            # Set up scanner for preview (lower resolution)
+            # Configure for film/transparency scanning
+            if not self.is_wia and 'WIA-' not in self.scanner_name:
+                try:
+                    # Set document source to transparency unit (film holder with backlight)
+                    try:
+                        # CAP_FEEDERENABLED = False for flatbed/transparency
+                        self.scanner.SetCapability(twain.CAP_FEEDERENABLED, twain.TWTY_BOOL, False)
+                    except:
+                        pass
+                    
+                    try:
+                        # Set to transparency/film mode (this enables backlight)
+                        # ICAP_LIGHTPATH = 0x1005, TWLP_TRANSMISSIVE = 1
+                        self.scanner.SetCapability(0x1005, twain.TWTY_UINT16, 1)
+                    except:
+                        self.logger.warning("Could not set transparency mode - may need to set in scanner UI")
+                    
+                    # Set resolution
+                    self.scanner.SetCapability(twain.ICAP_XRESOLUTION, twain.TWTY_FIX32, 150)
+                    self.scanner.SetCapability(twain.ICAP_YRESOLUTION, twain.TWTY_FIX32, 150)
+                except Exception as e:
+                    self.logger.warning(f"Could not set all capabilities for preview: {e}")
+            
+            # Request scan - Always show UI for film scanning configuration
+            self.logger.info("Showing scanner UI for film settings")
+            
+            # Show instruction for film scanning
+            messagebox.showinfo("Film Scanning - IMPORTANT!",
+                "The Epson Scan window will open.\n\n"
+                "CRITICAL STEPS:\n"
+                "1. Look for 'Document Type' or mode selector\n"
+                "2. Change from 'Reflective' to 'Film' or 'Transparency'\n"
+                "3. Select 'Negative Film' or 'Positive Film'\n"
+                "4. Choose film holder type (35mm, etc.)\n"
+                "5. Preview and select scan area\n\n"
+                "The backlight will turn ON when you select Film mode!")
+            
+            self.scanner.RequestAcquire(1, 1)  # Always show UI for film scanning
+            
+            # Get image data
+            rv = self.scanner.XferImageNatively()
+            
+            # Handle both return formats: (handle, more) or just handle
+            if isinstance(rv, tuple):
+                image_handle = rv[0]
+            else:
+                image_handle = rv
+            
+            if not image_handle:
+                raise Exception("No image data received from scanner")
+            
+            self.preview_image_original = self._dib_to_pil(image_handle)
+
+            if self.preview_image_original.size[0] == 0 or self.preview_image_original.size[1] == 0:
+                raise Exception("Invalid image dimensions received")
+            
+            self.set_preview(self.preview_image_original)
+            self.logger.info(f"Preview scan successful: {self.preview_image_original.size}")
+            self.update_preview_adjustments()
+            
+            self.root.after(0, lambda: self.status_label.config(text="Preview ready", fg='#00ff00'))
+            
+        except Exception as e:
+            error_msg = f"Preview failed: {str(e)}"
+            self.logger.error(f"{error_msg}\n{traceback.format_exc()}")
+            self.root.after(0, lambda: self.status_label.config(text=error_msg[:50], fg='#ff4444'))
+            self.root.after(0, lambda: messagebox.showerror("Preview Error", 
+                f"{error_msg}\n\nCheck the error log for details."))
+
+    def _dib_to_pil(self, image_handle):
+        """Convert a TWAIN DIB handle to a PIL image
+
+        Recent twain builds return the BMP bytes directly when
+        DIBToBMFile is called without a path, so the image can be decoded
+        in memory; the temp-BMP round trip through the filesystem (a full
+        extra image write and read at high DPI) is only the fallback for
+        builds without that support.
+        """
+        import io
+        import twain
+        try:
+            bmp_bytes = twain.DIBToBMFile(image_handle)
+            if bmp_bytes:
+                return Image.open(io.BytesIO(bmp_bytes))
+        except Exception as e:
+            self.logger.debug(f"In-memory DIB conversion failed: {str(e)}")
+
+        import tempfile
+        temp_bmp = tempfile.mktemp(suffix='.bmp')
+        try:
+            twain.DIBToBMFile(image_handle, temp_bmp)
+            img = Image.open(temp_bmp)
+            img.load()  # read the pixels now so the temp file can go away
+            return img
+        finally:
+            if os.path.exists(temp_bmp):
+                try:
+                    os.remove(temp_bmp)
+                except:
+                    pass
+
+    def display_preview(self, image):
+        """Display preview image on whichever widget hosts the preview"""
+        # Resize to fit the viewport
+        canvas_width, canvas_height = self._viewport_size()
+
+        if canvas_width < 100:  # Viewport not initialized yet
+            canvas_width = 800
+            canvas_height = 600
+        
+        # Calculate scaling
+        img_ratio = image.width / image.height
+        canvas_ratio = canvas_width / canvas_height
+        
+        if img_ratio > canvas_ratio:
+            new_width = canvas_width - 40
+            new_height = int(new_width / img_ratio)
+        else:
+            new_height = canvas_height - 40
+            new_width = int(new_height * img_ratio)
+        
+        # BILINEAR is plenty for a canvas-sized live preview; the 8-tap
+        # LANCZOS filter belongs on the save path, not at 30 redraws/s
+        resized = image.resize((new_width, new_height), Image.Resampling.BILINEAR)
+
+        # Blit into the existing PhotoImage when the size is unchanged -
+        # creating a new PhotoImage per redraw makes Tk register/free an
+        # image object every frame, which is the slow path on Windows
+        if (self._tkimg is not None
+                and self._tkimg.width() == new_width
+                and self._tkimg.height() == new_height):
+            # Both hosts reference the same PhotoImage, so the paste is all
+            # that is needed to refresh whichever one is showing
+            self._tkimg.paste(resized)
+        else:
+            self._tkimg = ImageTk.PhotoImage(resized)
+            self.preview_label.config(image=self._tkimg, text="")
+            if self._preview_host is self.preview_canvas:
+                self._show_on_canvas()
+
+    def _show_on_canvas(self):
+        """Attach the current PhotoImage to the crop canvas, centred"""
+        canvas_width = self.preview_canvas.winfo_width()
+        canvas_height = self.preview_canvas.winfo_height()
+        if self._canvas_img_id is None:
+            self._canvas_img_id = self.preview_canvas.create_image(
+                canvas_width // 2, canvas_height // 2, image=self._tkimg)
+        else:
+            self.preview_canvas.itemconfig(self._canvas_img_id, image=self._tkimg)
+            self.preview_canvas.coords(self._canvas_img_id,
+                                       canvas_width // 2, canvas_height // 2)
+    
+    def start_scan(self):
+        """Start a single scan"""
+        if not TWAIN_AVAILABLE or not self.scanner:
+            messagebox.showinfo("Demo Mode", "Scanning would occur here when scanner is connected")
+            return
+        
+        self.status_label.config(text="Scanning...", fg='#ffa500')
+        self.scan_btn.config(state=tk.DISABLED)
+        
+        # WIA scanners need UI on main thread
+        if self.is_wia or 'WIA-' in self.scanner_name:
+            self._do_scan()
+        else:
+            self._job_q.put(self._do_scan)
+    
+    def _do_scan(self):
+        """Perform scan in background thread"""
+        try:
+            # Snapshot the Tk variables once; every later read below is a
+            # plain local instead of a Tcl round trip from a worker thread
+            settings = self._snapshot_settings()
+            resolution = settings['resolution']
+            color_mode = settings['color_mode']
+            output_dir = settings['output_dir']
+
+            self.logger.info(f"Starting scan: {resolution} DPI, {color_mode} mode")
+
+            if not self.scanner:
+                raise Exception("Scanner not initialized")
+
+            # Validate output directory
+            if not os.path.exists(output_dir):
+                self.logger.info(f"Creating output directory: {output_dir}")
+                os.makedirs(output_dir, exist_ok=True)
+
+            if resolution < 75 or resolution > 6400:
+                raise ValueError(f"Invalid resolution: {resolution}. Must be between 75 and 6400 DPI.")
+            
+            self.logger.info(f"Scanner: {self.scanner_name}, is_wia: {self.is_wia}")
+            
+            # WIA drivers have limited capability support
+            if self.is_wia or 'WIA-' in self.scanner_name:
+                self.logger.warning("WIA scanner detected - using simplified settings")
+                self.logger.info("Note: Resolution, color mode, and film settings will be set through scanner UI")
+                self.logger.info("IMPORTANT: In the Epson dialog, select 'Film' or 'Transparency' as document type!")
+            else:
+                try:
+                    # Configure for film/transparency scanning
+                    try:
+                        # Disable feeder (use flatbed/transparency unit)
+                        self.scanner.SetCapability(twain.CAP_FEEDERENABLED, twain.TWTY_BOOL, False)
+                    except:
+                        pass
+                    
+                    try:
+                        # Set to transparency mode (enables backlight)
+                        # ICAP_LIGHTPATH = 0x1005, TWLP_TRANSMISSIVE = 1
+                        self.scanner.SetCapability(0x1005, twain.TWTY_UINT16, 1)
+                        self.logger.info("Transparency/film mode enabled (backlight on)")
+                    except:
+                        self.logger.warning("Could not set transparency mode - set 'Film' in scanner UI")
+                    
+                    # Set resolution
+                    self.scanner.SetCapability(twain.ICAP_XRESOLUTION, twain.TWTY_FIX32, resolution)
+                    self.scanner.SetCapability(twain.ICAP_YRESOLUTION, twain.TWTY_FIX32, resolution)
+                    
+                    # Set color mode
+                    if color_mode == "Color":
+                        pixel_type = twain.TWPT_RGB
+                    elif color_mode == "Grayscale":
+                        pixel_type = twain.TWPT_GRAY
+                    else:
+                        pixel_type = twain.TWPT_BW
+                    
+                    self.scanner.SetCapability(twain.ICAP_PIXELTYPE, twain.TWTY_UINT16, pixel_type)
+                except Exception as e:
+                    self.logger.warning(f"Could not set capabilities: {str(e)}. Using scanner defaults.")
+            
+            # Acquire image - Always show UI for film scanning
+            self.logger.debug("Requesting image acquisition...")
+            self.logger.info("Showing scanner UI for film settings")
+            
+            # Show instruction for film scanning
+            messagebox.showinfo("Film Scanning - IMPORTANT!",
+                "The Epson Scan window will open.\n\n"
+                "CRITICAL STEPS:\n"
+                "1. Look for 'Document Type' or mode selector\n"
+                "2. Change from 'Reflective' to 'Film' or 'Transparency'\n"
+                "3. Select 'Negative Film' or 'Positive Film'\n"
+                "4. Choose film holder type (35mm, etc.)\n"
+                "5. Set your scan resolution and area\n\n"
+                "The backlight will turn ON when you select Film mode!")
+            
+            self.scanner.RequestAcquire(1, 1)  # Always show UI for film scanning
+            
+            # Get image data
+            rv = self.scanner.XferImageNatively()
+            
+            # Handle both return formats: (handle, more) or just handle
+            if isinstance(rv, tuple):
+                image_handle = rv[0]
+            else:
+                image_handle = rv
+            
+            if not image_handle:
+                raise Exception("No image data received from scanner")
+            
+            image = self._dib_to_pil(image_handle)
+
+            if image.size[0] == 0 or image.size[1] == 0:
+                raise Exception("Invalid image dimensions received")
+            
+            self.logger.info(f"Image acquired: {image.size}, mode: {image.mode}")
+            
+            # Apply adjustments to scanned image. Pure 90-degree geometry
+            # going to TIFF/JPEG rides in the orientation tag instead of
+            # rewriting every pixel of the full-resolution scan.
+            orientation = self._geometry_as_orientation()
+            if orientation is None:
+                image = self.apply_all_transforms(image)
+
+            # Auto-detect film frames if enabled
+            if settings['auto_detect']:
+                self.logger.debug("Attempting frame detection...")
+                frames = self.detect_film_frames(image)
+                if frames:
+                    self.logger.info(f"Detected {len(frames)} frames")
+                    self.root.after(0, lambda: self.status_label.config(
+                        text=f"Detected {len(frames)} frames, saving...", fg='#ffa500'))
+                    self.save_detected_frames(image, frames)
+                    return
+                else:
+                    self.logger.debug("No frames detected, saving as single image")
+
+            # Save single image (no auto-detect or no frames found)
+            filename = self.generate_filename()
+            filepath = os.path.join(output_dir, filename)
+
+            os.makedirs(output_dir, exist_ok=True)
+            
+            # Validate filepath
+            if len(filepath) > 260:  # Windows path length limit
+                raise Exception("File path too long. Choose a shorter output directory or filename.")
+            
+            self.logger.info(f"Saving image to: {filepath}")
+
+            # Encode in the worker pool so the scanner is free to start
+            # the next acquisition while this image compresses
+            future = self._submit_encode(image, filepath, orientation)
+            future.add_done_callback(
+                lambda f, path=filepath: self._on_encode_done(f, path))
+
+        except ValueError as e:
+            error_msg = f"Invalid setting: {str(e)}"
+            self.logger.error(error_msg)
+            self.root.after(0, lambda: self.scan_failed(error_msg))
+            
+        except PermissionError as e:
+            error_msg = f"Permission denied: Cannot write to output directory"
+            self.logger.error(f"{error_msg}: {str(e)}")
+            self.root.after(0, lambda: self.scan_failed(error_msg))
+            
+        except Exception as e:
+            error_msg = f"Scan error: {str(e)}"
+            self.logger.error(f"{error_msg}\n{traceback.format_exc()}")
+            self.root.after(0, lambda: self.scan_failed(error_msg))
+    
+    def _submit_encode(self, image, filepath, orientation=None):
+        """Submit a full-resolution image to the encode process pool"""
+        if self._encode_pool is None:
+            self._encode_pool = concurrent.futures.ProcessPoolExecutor(max_workers=2)
+        return self._encode_pool.submit(
+            _encode_and_save, image.tobytes(), image.size, image.mode,
+            filepath, self.file_format.get(), orientation,
+            self._tiff_compression_name())
+
+    def _tiff_compression_name(self):
+        """Map the UI compression setting to Pillow's encoder name"""
+        return 'tiff_lzw' if self.tiff_compression.get() == 'LZW' else 'tiff_deflate'
+
+    def _geometry_as_orientation(self):
+        """Map the current rotation/flips to an EXIF orientation code
+
+        Returns the 1..8 code when the only active adjustments are
+        90-degree geometry and the target format carries an orientation
+        tag (TIFF/JPEG); viewers then honor the tag without this end
+        paying an O(pixels) rewrite of a 100+ MP scan. Returns None when
+        the pixels must be transformed anyway.
+        """
+        if (self.brightness.get() != 1.0 or self.contrast.get() != 1.0
+                or self.exposure.get() != 0.0 or self.invert_negative.get()
+                or self.remove_dust.get()):
+            return None
+        if self.file_format.get() == "PNG" or self.auto_detect.get():
+            return None
+        angle = self.rotation_angle.get() % 360
+        if angle % 90:
+            return None
+        hflip = self.flip_horizontal.get()
+        vflip = self.flip_vertical.get()
+        # vflip after a rotation equals hflip with 180 more degrees, so
+        # every combination reduces to (angle, hflip)
+        if vflip:
+            angle = (angle + 180) % 360
+            hflip = not hflip
+        if hflip:
+            code = {0: 2, 90: 5, 180: 4, 270: 7}[angle]
+        else:
+            code = {0: 1, 90: 6, 180: 3, 270: 8}[angle]
+        return code if code != 1 else None
+
+    def _on_encode_done(self, future, filepath):
+        """Verify and report a finished background encode"""
+        try:
+            future.result()
+
+            if not os.path.exists(filepath):
+                raise Exception("File was not created successfully")
+
+            file_size = os.path.getsize(filepath) / (1024 * 1024)  # MB
+            self.logger.info(f"Scan completed successfully: {file_size:.2f} MB")
+
+            self.scanned_images.append(filepath)
+            self.root.after(0, self.scan_complete, filepath)
+        except Exception as e:
+            error_msg = f"Save error: {str(e)}"
+            self.logger.error(f"{error_msg}\n{traceback.format_exc()}")
+            self.root.after(0, lambda: self.scan_failed(error_msg))
+
+    def apply_all_transforms(self, image):
+        """Apply all transformations and adjustments to an image"""
+        return self._pipeline(image)
+    
+    def generate_filename(self):
+        """Generate filename for scanned image"""
+        return self._generate_filenames(1)[0]
+
+    def _generate_filenames(self, n, file_format=None):
+        """Generate n unique filenames from a single timestamp/counter read
+
+        Frames cut from one scan are saved in the same second, so naming
+        them one at a time would both repeat the strftime work and hand
+        every frame the same timestamp name. Batch the names up front.
+        Queue post-processing passes its item's file_format explicitly;
+        the live Tk variable is only consulted when none is given.
+        """
+        ext_map = {"TIFF": "tif", "PNG": "png", "JPEG": "jpg"}
+        if file_format is None:
+            file_format = self.file_format.get()
+        ext = ext_map[file_format]
+
+        if self.auto_increment.get():
+            start = self.scan_counter
+            self.scan_counter += n
+            return [f"film_scan_{start + i:04d}.{ext}" for i in range(n)]
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if n == 1:
+            return [f"film_scan_{timestamp}.{ext}"]
+        return [f"film_scan_{timestamp}_{i + 1:02d}.{ext}" for i in range(n)]
+    
+    def detect_film_frames(self, image):
+        """Detect individual film frames in a scanned image"""
+        try:
+            # Bounding boxes don't need scanner resolution - detect on a
+            # ~1 MP thumbnail and scale the coordinates back up at the end
+            scale = max(1, max(image.size) // 1024)
+            # reduce() is a straight box filter in C - cheaper than a
+            # general resample and exactly right for integer decimation
+            thumb = image.reduce(scale) if scale > 1 else image
+
+            # Convert to grayscale for analysis
+            gray = ImageOps.grayscale(thumb)
+
+            # Convert to numpy array (read-only pass, so no copy needed)
+            img_array = np.asarray(gray)
+            
+            # Find bright areas (film frames are typically brighter than
+            # background). Otsu picks the split point from the histogram, so
+            # it is exposure-independent unlike the old mean + 0.5*std rule
+            thresh = self._otsu_threshold(img_array)
+
+            # Find contiguous regions (simple row/column analysis)
+            frames = []
+            min_frame_size = 1000  # Minimum pixels for a frame
+
+            # Detect columns with content. The JIT kernel fuses the
+            # threshold comparison into the column reduction so no binary
+            # intermediate is materialized; the NumPy fallback keeps the
+            # mask but accumulates in narrow uint16 lanes instead of the
+            # int64 promotion np.sum defaults to for bool input
+            kernel = _load_colsum_kernel()
+            if kernel is not None:
+                col_sums = kernel(img_array, thresh)
+                binary = None
+            else:
+                binary = img_array > thresh
+                col_sums = np.add.reduce(binary, axis=0, dtype=np.uint16)
+            col_threshold = img_array.shape[0] * 0.1  # At least 10% of column height
+
+            above = np.concatenate(([False], col_sums > col_threshold, [False]))
+            edges = np.flatnonzero(np.diff(above.astype(np.int8)))
+            starts, ends = edges[::2], edges[1::2]
+            # A run still open at the right edge is a frame cut off by the
+            # scan bounds; skip it like the old scanner loop did
+            if above[-2]:
+                starts, ends = starts[:-1], ends[:-1]
+
+            # Prefix-sum the mask once: any candidate's row profile is then
+            # two column reads instead of re-summing its whole H x width
+            # slab. uint16 holds counts up to the thumbnail width. The mask
+            # is only built here, when a candidate actually needs it.
+            if len(starts):
+                if binary is None:
+                    binary = img_array > thresh
+                csum = np.cumsum(binary, axis=1, dtype=np.uint16)
+
+            for frame_start, i in zip(starts.tolist(), ends.tolist()):
+                frame_width = i - frame_start
+                if frame_width * scale > 100:  # Minimum width (full-res pixels)
+                    # Now find top and bottom of frame
+                    row_sums = csum[:, i - 1]
+                    if frame_start > 0:
+                        row_sums = row_sums - csum[:, frame_start - 1]
+                    row_threshold = frame_width * 0.1
+
+                    # argmax on the mask finds the first/last hits without
+                    # materializing an index array for every content row
+                    row_mask = row_sums > row_threshold
+                    if int(np.count_nonzero(row_mask)) * scale > 100:  # Minimum height
+                        top = int(np.argmax(row_mask)) * scale
+                        bottom = int(row_mask.size - 1 - np.argmax(row_mask[::-1])) * scale
+
+                        # Map back to full resolution and add some padding
+                        padding = 10
+                        left = max(0, frame_start * scale - padding)
+                        right = min(image.width, i * scale + padding)
+                        top = max(0, top - padding)
+                        bottom = min(image.height, bottom + padding)
+
+                        frames.append((left, top, right, bottom))
+
+            return frames
+            
+        except Exception as e:
+            print(f"Error detecting frames: {e}")
+            return []
+    
+    def _otsu_threshold(self, img_array):
+        """Compute an Otsu threshold for a grayscale array
+
+        One bincount pass over the pixels, then the between-class
+        variance maximization runs on the 256 bins.
+        """
+        hist = np.bincount(img_array.ravel(), minlength=256)
+        w0 = hist.cumsum()
+        m = (hist * np.arange(256)).cumsum()
+        w1 = w0[-1] - w0
+        mu0 = m / np.maximum(w0, 1)
+        mu1 = (m[-1] - m) / np.maximum(w1, 1)
+        between = w0 * w1 * (mu0 - mu1) ** 2
+        return int(np.argmax(between))
+
+    def save_detected_frames(self, source_image, frames):
+        """Save individual detected frames"""
+        try:
+            saved_files = []
+            file_format = self.file_format.get()
+            output_dir = pathlib.Path(self.output_dir.get())
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+            # Fan the per-frame encodes out to the writer pool - Pillow
+            # releases the GIL while compressing, so frames encode in
+            # parallel - then wait so completion only fires once every
+            # file is on disk
+            futures = []
+            names = self._generate_filenames(len(frames))
+            for (left, top, right, bottom), filename in zip(frames, names):
+                frame_img = source_image.crop((left, top, right, bottom))
+                filepath = str(output_dir / filename)
+                futures.append(self._submit_frame_encode(frame_img, filepath, file_format))
+                saved_files.append(filepath)
+                self.scanned_images.append(filepath)
+
+            # Each crop owns its pixels, so drop the 100+ MP source now
+            # rather than holding it for the whole encode wait
+            del source_image
+
+            for future in futures:
+                future.result()
+
+            if saved_files:
+                self.root.after(0, lambda: self.multi_scan_complete(saved_files))
+            else:
+                self.root.after(0, lambda: self.scan_failed("No frames detected"))
+
+        except Exception as e:
+            self.root.after(0, lambda: self.scan_failed(f"Error saving frames: {str(e)}"))
+
+    def _submit_frame_encode(self, frame_img, filepath, file_format):
+        """Queue one cropped frame for encoding on the writer pool"""
+        if self._io_pool is None:
+            self._io_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1))
+        return self._io_pool.submit(self._encode_frame, frame_img, filepath,
+                                    file_format, self._tiff_compression_name())
+
+    def _encode_frame(self, frame_img, filepath, file_format, tiff_compression):
+        """Encode a single frame to disk (runs on the writer pool)"""
+        if file_format == "TIFF":
+            tiffinfo = {317: 2} if tiff_compression == 'tiff_deflate' else {}
+            frame_img.save(filepath, "TIFF", compression=tiff_compression,
+                           tiffinfo=tiffinfo)
+        elif file_format == "PNG":
+            frame_img.save(filepath, "PNG")
+        else:
+            frame_img.save(filepath, "JPEG", quality=95, optimize=False,
+                           progressive=False)
+    
+    def multi_scan_complete(self, filepaths):
+        """Handle successful multi-frame scan"""
+        self.status_label.config(text=f"Saved {len(filepaths)} frames!", fg='#00ff00')
+        self.scan_btn.config(state=tk.NORMAL)
+        self.stats_label.config(text=f"Scans completed: {len(self.scanned_images)}")
+        files_list = "\n".join([os.path.basename(f) for f in filepaths[:10]])
+        if len(filepaths) > 10:
+            files_list += f"\n... and {len(filepaths) - 10} more"
+        messagebox.showinfo("Scan Complete", f"Saved {len(filepaths)} frames:\n{files_list}")
+    
+    def scan_complete(self, filepath):
+        """Handle successful scan"""
+        self.status_label.config(text="Scan complete!", fg='#00ff00')
+        self.scan_btn.config(state=tk.NORMAL)
+        self.stats_label.config(text=f"Scans completed: {len(self.scanned_images)}")
+        messagebox.showinfo("Scan Complete", f"Image saved to:\n{filepath}")
+    
+    def scan_failed(self, error):
+        """Handle scan failure"""
+        self.status_label.config(text=f"Scan failed", fg='#ff4444')
+        self.scan_btn.config(state=tk.NORMAL)
+        
+        error_details = f"Error during scanning:\n{error}\n\n"
+        error_details += "Troubleshooting tips:\n"
+        error_details += "• Check scanner is connected and powered on\n"
+        error_details += "• Ensure scanner driver is installed\n"
+        error_details += "• Try lowering the resolution\n"
+        error_details += "• Check output directory permissions\n"
+        error_details += "• View error log for more details\n"
+        
+        messagebox.showerror("Scan Failed", error_details)
+        self.logger.error(f"Scan failed: {error}")
+    
+    def batch_scan(self):
+        """Start batch scanning mode"""
+        if not TWAIN_AVAILABLE or not self.scanner:
+            messagebox.showinfo("Demo Mode", "Batch scanning would occur here when scanner is connected")
+            return
+        
+        count = simpledialog.askinteger("Batch Scan", "How many images to scan?", 
+                                          initialvalue=5, minvalue=1, maxvalue=100)
+        if count:
+            self.status_label.config(text=f"Batch scanning {count} images...", fg='#ffa500')
+            self._job_q.put(lambda: self._do_batch_scan(count))
+    
+    def _do_batch_scan(self, count):
+        """Perform batch scan"""
+        for i in range(count):
+            self.root.after(0, lambda i=i: self.status_label.config(
+                text=f"Scanning {i+1} of {count}...", fg='#ffa500'))
+            self._do_scan()
+            if i < count - 1:
+                self.root.after(0, lambda: messagebox.showinfo("Ready", "Load next film and click OK"))
+        
+        self.root.after(0, lambda: self.status_label.config(text="Batch scan complete!", fg='#00ff00'))
+    
+    def _snapshot_settings(self):
+        """Read every scan-relevant Tk variable once into a plain dict
+
+        Worker threads branch on these values repeatedly; each .get() is
+        a locked Tcl round trip, so hot paths take one snapshot up front.
+        The same dict doubles as a queue item.
+        """
+        return {
+            'resolution': self.resolution.get(),
+            'color_mode': self.color_mode.get(),
+            'file_format': self.file_format.get(),
+            'brightness': self.brightness.get(),
+            'contrast': self.contrast.get(),
+            'exposure': self.exposure.get(),
+            'invert_negative': self.invert_negative.get(),
+            'remove_dust': self.remove_dust.get(),
+            'rotation_angle': self.rotation_angle.get(),
+            'flip_horizontal': self.flip_horizontal.get(),
+            'flip_vertical': self.flip_vertical.get(),
+            'auto_detect': self.auto_detect.get(),
+            'output_dir': self.output_dir.get(),
+        }
+
+    def add_to_queue(self):
+        """Add current settings to scan queue"""
+        try:
+            # Validate settings before adding
+            if self.resolution.get() < 75 or self.resolution.get() > 6400:
+                messagebox.showerror("Invalid Settings", "Resolution must be between 75 and 6400 DPI")
+                return
+            
+            if not os.path.exists(self.output_dir.get()):
+                if not messagebox.askyesno("Create Directory", 
+                    f"Output directory does not exist:\n{self.output_dir.get()}\n\nCreate it now?"):
+                    return
+                os.makedirs(self.output_dir.get(), exist_ok=True)
+            
+            queue_item = self._snapshot_settings()
+            queue_item['timestamp'] = datetime.now().strftime("%H:%M:%S")
+            
+            self.scan_queue.append(queue_item)
+            self.logger.info(f"Added scan to queue: {len(self.scan_queue)} items total")
+            self.update_queue_display()
+            messagebox.showinfo("Added to Queue", 
+                              f"Scan added to queue with current settings\n"
+                              f"Resolution: {queue_item['resolution']} DPI\n"
+                              f"Queue position: {len(self.scan_queue)}")
+            
+        except Exception as e:
+            error_msg = f"Could not add to queue: {str(e)}"
+            self.logger.error(error_msg)
+            messagebox.showerror("Queue Error", error_msg)
+    
+    def clear_queue(self):
+        """Clear all items from queue"""
+        if not self.scan_queue:
+            messagebox.showinfo("Queue Empty", "No items in queue to clear")
+            return
+        
+        if messagebox.askyesno("Clear Queue", f"Clear all {len(self.scan_queue)} items from queue?"):
+            self.scan_queue.clear()
+            self.update_queue_display()
+    
+    def update_queue_display(self):
+        """Update queue status display"""
+        count = len(self.scan_queue)
+        self.queue_label.config(text=f"Queue: {count} scan{'s' if count != 1 else ''}")
+        
+        if count > 0 and not self.queue_processing:
+            self.process_queue_btn.config(state=tk.NORMAL)
+        else:
+            self.process_queue_btn.config(state=tk.DISABLED if self.queue_processing else tk.NORMAL)
+    
+    def process_queue(self):
+        """Start processing the scan queue"""
+        if not self.scan_queue:
+            messagebox.showinfo("Queue Empty", "No scans in queue to process")
+            return
+        
+        if not TWAIN_AVAILABLE or not self.scanner:
+            messagebox.showinfo("Demo Mode", "Queue processing would occur here when scanner is connected")
+            return
+        
+        self.queue_processing = True
+        self.queue_paused = False
+        self._queue_resume.set()
+        self.process_queue_btn.config(state=tk.DISABLED)
+        self.pause_queue_btn.config(state=tk.NORMAL)
+        self.scan_btn.config(state=tk.DISABLED)
+        self.batch_btn.config(state=tk.DISABLED)
+        
+        self.status_label.config(text=f"Processing queue: {len(self.scan_queue)} items...", fg='#ffa500')
+        self._job_q.put(self._process_queue_thread)
+    
+    def toggle_pause_queue(self):
+        """Pause or resume queue processing"""
+        self.queue_paused = not self.queue_paused
+        
+        if self.queue_paused:
+            self._queue_resume.clear()
+            self.pause_queue_btn.config(text="▶ Resume Queue", bg='#28a745')
+            self.status_label.config(text="Queue paused", fg='#ffa500')
+        else:
+            self._queue_resume.set()
+            self.pause_queue_btn.config(text="⏸ Pause Queue", bg='#ffc107')
+            self.status_label.config(text="Queue processing...", fg='#ffa500')
+    
+    def _process_queue_thread(self):
+        """Process all items in the queue"""
+        total = len(self.scan_queue)
+        completed = 0
+        
+        while self.scan_queue and self.queue_processing:
+            # Block here while paused; resume sets the event so the worker
+            # wakes immediately instead of on a 0.5 s poll
+            self._queue_resume.wait()
+
+            if not self.queue_processing:
+                break
+            
+            # Get next item from queue
+            queue_item = self.scan_queue[0]
+            completed += 1
+            
+            self.root.after(0, lambda c=completed, t=total: self.status_label.config(
+                text=f"Queue: Scanning {c} of {t}...", fg='#ffa500'))
+            
+            # Apply settings from queue item
+            self.root.after(0, lambda item=queue_item: self._apply_queue_settings(item))
+            threading.Event().wait(0.5)  # Give UI time to update
+            
+            # Perform the scan
+            try:
+                self._do_scan_from_queue(queue_item)
+                
+                # Remove completed item
+                self.scan_queue.pop(0)
+                self.root.after(0, self.update_queue_display)
+                
+                # Prompt to load next film if more items in queue
+                if self.scan_queue:
+                    self.root.after(0, lambda c=completed, t=total: 
+                                  messagebox.showinfo("Next Scan", 
+                                                    f"Completed {c} of {t}\n\n"
+                                                    "Load next film and click OK to continue"))
+            
+            except Exception as e:
+                self.root.after(0, lambda err=str(e): 
+                              messagebox.showerror("Queue Error", 
+                                                 f"Error during queue processing:\n{err}\n\nQueue stopped."))
+                break
+        
+        # Wait for the post-processing thread to drain before reporting
+        # completion, so "done" means every file is actually on disk
+        self._post_q.join()
+
+        error = self._post_error
+        self._post_error = None
+
+        # Queue finished
+        self.queue_processing = False
+        if error:
+            self.root.after(0, lambda err=error: messagebox.showerror(
+                "Queue Error", f"Error during queue processing:\n{err}"))
+        self.root.after(0, self._queue_complete, completed, error is not None)
+    
+    def _apply_queue_settings(self, queue_item):
+        """Apply settings from queue item to current settings"""
+        self.resolution.set(queue_item['resolution'])
+        self.color_mode.set(queue_item['color_mode'])
+        self.file_format.set(queue_item['file_format'])
+        self.brightness.set(queue_item['brightness'])
+        self.contrast.set(queue_item['contrast'])
+        self.exposure.set(queue_item['exposure'])
+        self.invert_negative.set(queue_item['invert_negative'])
+        self.remove_dust.set(queue_item['remove_dust'])
+        self.rotation_angle.set(queue_item['rotation_angle'])
+        self.flip_horizontal.set(queue_item['flip_horizontal'])
+        self.flip_vertical.set(queue_item['flip_vertical'])
+        self.auto_detect.set(queue_item['auto_detect'])
+    
+    def _do_scan_from_queue(self, queue_item):
+        """Acquire one queued scan and hand it to the post-process thread"""
+        try:
+            # Resolve the fields used below once
+            resolution = queue_item['resolution']
+            color_mode = queue_item['color_mode']
+
+            # Configure scanner
+            self.scanner.SetCapability(twain.ICAP_XRESOLUTION, twain.TWTY_FIX32, resolution)
+            self.scanner.SetCapability(twain.ICAP_YRESOLUTION, twain.TWTY_FIX32, resolution)
+
+            # Set color mode
+            if color_mode == "Color":
+                pixel_type = twain.TWPT_RGB
+            elif color_mode == "Grayscale":
+                pixel_type = twain.TWPT_GRAY
+            else:
+                pixel_type = twain.TWPT_BW
+            
+            self.scanner.SetCapability(twain.ICAP_PIXELTYPE, twain.TWTY_UINT16, pixel_type)
+            
+            # Acquire image
+            self.scanner.RequestAcquire(0, 0)
+            image_data = self.scanner.XferImageNatively()[0]
+            image = Image.open(image_data)
+
+            # Hand off to the post-processing thread so the scanner is free
+            # to acquire the next item; the bounded queue blocks here if
+            # processing falls more than two scans behind
+            self._post_q.put((image, queue_item))
+
+        except Exception as e:
+            raise Exception(f"Scan failed: {str(e)}")
+
+    def _postprocess_queue_item(self, image, queue_item):
+        """Transform, detect and save one queued scan (post-process thread)
+
+        Everything format- and path-related comes from the queue item:
+        while this item is processed the main thread has already applied
+        the NEXT item's settings to the live Tk variables.
+        """
+        file_format = queue_item['file_format']
+        output_dir = queue_item['output_dir']
+
+        # Apply transformations (using queue settings)
+        image = self._apply_transforms_from_queue(image, queue_item)
+
+        # Auto-detect or save
+        if queue_item['auto_detect']:
+            frames = self.detect_film_frames(image)
+            if frames:
+                self._save_frames_sync(image, frames, file_format, output_dir)
+                return
+
+        # Save single image
+        filename = self._generate_filenames(1, file_format)[0]
+        filepath = os.path.join(output_dir, filename)
+        os.makedirs(output_dir, exist_ok=True)
+
+        if file_format == "TIFF":
+            compression = self._tiff_compression_name()
+            tiffinfo = {317: 2} if compression == 'tiff_deflate' else {}
+            image.save(filepath, "TIFF", compression=compression, tiffinfo=tiffinfo)
+        elif file_format == "PNG":
+            image.save(filepath, "PNG")
+        else:
+            image.save(filepath, "JPEG", quality=95, optimize=False,
+                       progressive=False)
+
+        self.scanned_images.append(filepath)
+
+
+    def _apply_transforms_from_queue(self, image, queue_item):
+        """Apply transformations from queue settings"""
+        # Bind the hot fields to locals once; every stage below returns a
+        # new image anyway, so the old unconditional copy was pure waste
+        angle = queue_item['rotation_angle']
+        hflip = queue_item['flip_horizontal']
+        vflip = queue_item['flip_vertical']
+        brightness = queue_item['brightness']
+        contrast = queue_item['contrast']
+        exposure = queue_item['exposure']
+        dust = queue_item['remove_dust']
+        img = image
+
+        # Geometry: every 90-degree rotation/flip combination is one of the
+        # eight dihedral transforms, so collapse it into a single transpose
+        # pass instead of a resampling rotate plus separate flips
+        if angle % 90 == 0:
+            angle %= 360
+            # vflip after a rotation equals hflip with 180 more degrees
+            if vflip:
+                angle = (angle + 180) % 360
+                hflip = not hflip
+            if hflip:
+                op = {0: Image.Transpose.FLIP_LEFT_RIGHT,
+                      90: Image.Transpose.TRANSPOSE,
+                      180: Image.Transpose.FLIP_TOP_BOTTOM,
+                      270: Image.Transpose.TRANSVERSE}[angle]
+            else:
+                op = {0: None,
+                      90: Image.Transpose.ROTATE_270,
+                      180: Image.Transpose.ROTATE_180,
+                      270: Image.Transpose.ROTATE_90}[angle]
+            if op is not None:
+                img = img.transpose(op)
+        else:
+            if angle:
+                img = img.rotate(-angle, expand=True)
+            if hflip and vflip:
+                img = img.transpose(Image.Transpose.ROTATE_180)
+            elif hflip:
+                img = img.transpose(Image.Transpose.FLIP_LEFT_RIGHT)
+            elif vflip:
+                img = img.transpose(Image.Transpose.FLIP_TOP_BOTTOM)
+
+        # Adjustments: brightness, contrast, exposure and inversion are all
+        # linear in the pixel value, so compose them into the same fused
+        # gain/bias LUT the live pipeline uses and apply it in one pass
+        invert = queue_item['invert_negative'] and img.mode in ['RGB', 'L']
+        if brightness != 1.0 or contrast != 1.0 or exposure != 0.0 or invert:
+            exposure_factor = 1.0 + exposure
+            gain = brightness * contrast * exposure_factor
+            bias = 128.0 * (1.0 - contrast) * exposure_factor
+            lut = self._build_tone_lut(gain, bias, invert)
+            img = img.point(lut.tolist() * len(img.getbands()))
+
+        if dust:
+            img = self._remove_dust_filter(img)
+
+        return img
+    
+    def _save_frames_sync(self, source_image, frames, file_format, output_dir):
+        """Save frames for queue processing, returning once all are written
+
+        file_format and output_dir are passed in from the queue item
+        rather than read from the Tk variables, which already hold the
+        next item's settings while this one is being post-processed.
+        """
+        output_dir = pathlib.Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        futures = []
+        names = self._generate_filenames(len(frames), file_format)
+        for (left, top, right, bottom), filename in zip(frames, names):
+            frame_img = source_image.crop((left, top, right, bottom))
+            filepath = str(output_dir / filename)
+            futures.append(self._submit_frame_encode(frame_img, filepath, file_format))
+            self.scanned_images.append(filepath)
+
+        # The crops are self-contained; let the full scan be collected
+        # while the writer pool drains
+        del source_image
+
+        for future in futures:
+            future.result()
+    
+    def _queue_complete(self, completed, failed=False):
+        """Handle queue completion"""
+        self.queue_processing = False
+        self.process_queue_btn.config(state=tk.NORMAL if self.scan_queue else tk.DISABLED)
+        self.pause_queue_btn.config(state=tk.DISABLED, text="⏸ Pause Queue", bg='#ffc107')
+        self.scan_btn.config(state=tk.NORMAL)
+        self.batch_btn.config(state=tk.NORMAL)
+        if failed:
+            self.status_label.config(text="Queue finished with errors - check the log", fg='#ff4444')
+        else:
+            self.status_label.config(text=f"Queue complete! {completed} scans processed", fg='#00ff00')
+        self.stats_label.config(text=f"Scans completed: {len(self.scanned_images)}")
+        self.update_queue_display()
+
+        if not failed:
+            messagebox.showinfo("Queue Complete",
+                              f"All queue items processed!\n\n"
+                              f"Completed: {completed} scans\n"
+                              f"Total session scans: {len(self.scanned_images)}")
+
+
+def main():
+    root = tk.Tk()
+    app = FilmScannerApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()